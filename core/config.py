@@ -8,6 +8,8 @@ class Settings:
     FIREBASE_API_KEY = os.getenv("FIREBASE_API_KEY")
     FIREBASE_STORAGE_BUCKET = os.getenv("FIREBASE_STORAGE_BUCKET", "your-project-name.appspot.com")
     FIREBASE_PROJECT_ID = os.getenv("FIREBASE_PROJECT_ID")
+    # Named Firestore database; unset uses the project's "(default)" database
+    FIRESTORE_DATABASE_ID = os.getenv("FIRESTORE_DATABASE_ID")
     
     # Gemini AI Configuration
     GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
@@ -17,4 +17,10 @@ if not firebase_admin._apps:
         'storageBucket': settings.FIREBASE_STORAGE_BUCKET
     })
 
-db = firestore.client()
\ No newline at end of file
+# Name of the Firestore database everything reads and writes; anything that
+# talks to Firestore without going through 'db' (extra clients, REST) uses it
+FIRESTORE_DATABASE = settings.FIRESTORE_DATABASE_ID or "(default)"
+
+# The one process-wide Firestore client: every module imports this 'db', so
+# they all share its gRPC channel instead of opening their own
+db = firestore.client(database_id=FIRESTORE_DATABASE)
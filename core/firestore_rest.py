@@ -0,0 +1,113 @@
+# core/firestore_rest.py
+"""
+Minimal client for Firestore's REST documents:batchWrite endpoint.
+
+batchWrite applies up to 500 unrelated writes per request (no transaction,
+no ordering), which is all bulk seeding needs and avoids the Admin SDK's
+per-batch bookkeeping. Only plain JSON-like values are encoded.
+"""
+import base64
+import time
+from datetime import datetime, timezone
+
+import firebase_admin
+from google.auth.transport.requests import AuthorizedSession
+
+from core.config import settings
+from core.firebase import FIRESTORE_DATABASE
+
+FIRESTORE_API_URL = "https://firestore.googleapis.com/v1"
+# Firestore limit for one batchWrite request
+MAX_BATCH_WRITES = 500
+# Transient HTTP statuses (throttling / unavailable) retried with backoff
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 503, 504})
+MAX_RETRIES = 3
+
+
+# Exact-type encoders for the value types seed documents are made of. A
+# single dict lookup on type(value) replaces the isinstance() chain below,
+# which is still used for subclasses and the rarer types.
+_ENCODERS = {
+    str: lambda v: {"stringValue": v},
+    float: lambda v: {"doubleValue": v},
+    int: lambda v: {"integerValue": str(v)},
+    bool: lambda v: {"booleanValue": v},
+    type(None): lambda v: {"nullValue": None},
+    dict: lambda v: {"mapValue": {"fields": encode_fields(v)}},
+    list: lambda v: {"arrayValue": {"values": [encode_value(x) for x in v]}},
+}
+
+
+def encode_value(value) -> dict:
+    """Encodes a Python value as a Firestore REST 'Value'."""
+    encoder = _ENCODERS.get(type(value))
+    if encoder is not None:
+        return encoder(value)
+    return _encode_value_slow(value)
+
+
+def _encode_value_slow(value) -> dict:
+    if value is None:
+        return {"nullValue": None}
+    # bool first: it is a subclass of int
+    if isinstance(value, bool):
+        return {"booleanValue": value}
+    if isinstance(value, int):
+        return {"integerValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, str):
+        return {"stringValue": value}
+    if isinstance(value, bytes):
+        return {"bytesValue": base64.b64encode(value).decode("ascii")}
+    if isinstance(value, datetime):
+        # timestampValue must be RFC 3339, i.e. carry an offset; a naive
+        # datetime is taken as local time, like the SDK does
+        return {"timestampValue": value.astimezone(timezone.utc).isoformat()}
+    if isinstance(value, dict):
+        return {"mapValue": {"fields": encode_fields(value)}}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [encode_value(v) for v in value]}}
+    raise TypeError(f"Cannot encode {type(value).__name__} for Firestore REST")
+
+
+def encode_fields(data: dict) -> dict:
+    return {str(key): encode_value(value) for key, value in data.items()}
+
+
+class RestBatchWriter:
+    """Writes (collection, doc_id, data) tuples through documents:batchWrite."""
+
+    def __init__(self, project_id: str | None = None, database: str = FIRESTORE_DATABASE):
+        app = firebase_admin.get_app()
+        self.project_id = project_id or settings.FIREBASE_PROJECT_ID or app.project_id
+        self._documents = f"projects/{self.project_id}/databases/{database}/documents"
+        # AuthorizedSession refreshes the access token as needed
+        self._session = AuthorizedSession(app.credential.get_credential())
+
+    def batch_write(self, writes) -> list:
+        """
+        Sets every document in 'writes' (at most MAX_BATCH_WRITES).
+        Returns the writes that Firestore rejected; raises on HTTP errors.
+        """
+        writes = list(writes)
+        if len(writes) > MAX_BATCH_WRITES:
+            raise ValueError(f"batchWrite takes at most {MAX_BATCH_WRITES} writes, got {len(writes)}")
+
+        body = {
+            "writes": [
+                {"update": {"name": f"{self._documents}/{collection}/{doc_id}", "fields": encode_fields(data)}}
+                for collection, doc_id, data in writes
+            ]
+        }
+        url = f"{FIRESTORE_API_URL}/{self._documents}:batchWrite"
+        for attempt in range(MAX_RETRIES + 1):
+            response = self._session.post(url, json=body, timeout=60)
+            if response.status_code not in RETRYABLE_STATUS_CODES or attempt == MAX_RETRIES:
+                break
+            time.sleep(0.5 * 2 ** attempt)
+        response.raise_for_status()
+
+        # One status per write, in order; code 0 (or missing) means OK
+        statuses = response.json().get("status", [])
+        return [write for write, status in zip(writes, statuses) if status.get("code", 0) != 0]
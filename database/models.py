@@ -11,6 +11,7 @@ from typing import Optional, List, Dict, Any, Generic, TypeVar, Literal
 import datetime
 from datetime import timezone
 import math
+from statistics import fmean
 
 # ========== Pagination Model (Unchanged) ===========
 T = TypeVar("T")
@@ -30,7 +31,7 @@ class StudentProgress(RootModel):
         return v
     def get_average_progress(self) -> float:
         if not self.root: return 0.0
-        return sum(self.root.values()) / len(self.root)
+        return fmean(self.root.values())
 
 class BloomEntry(RootModel):
     root: Dict[str, int]
@@ -2,6 +2,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 import uvicorn
+from contextlib import asynccontextmanager
 from datetime import datetime
 from core.config import settings
 from core.firebase import db
@@ -13,6 +14,18 @@ from routes import (
     subjects, analytics, utilities, generated_content,
     diagnostics, study_sessions, content_verification
 )
+from services.recommender import start_recommendation_writer, stop_recommendation_writer
+from services.role_service import preload_roles
+from utils.firebase_utils import close_http_client
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Starts/stops background workers with the app"""
+    start_recommendation_writer()
+    await preload_roles()
+    yield
+    await stop_recommendation_writer()
+    await close_http_client()
 
 app = FastAPI(
     title="Cognify API",
@@ -23,7 +36,8 @@ app = FastAPI(
     contact={
         "name": "Cognify Development Team",
         "email": "support@cognify.edu"
-    }
+    },
+    lifespan=lifespan
 )
 
 # Middleware setup
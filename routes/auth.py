@@ -3,14 +3,13 @@ import asyncio
 from fastapi import APIRouter, HTTPException, Request, status, Depends
 from fastapi.responses import JSONResponse
 from firebase_admin import auth
-import requests
 
 # --- IMPORT MODELS FROM database/models.py ---
 from database.models import UserProfileBase
 from pydantic import BaseModel, EmailStr
 from services import profile_service
 from services.role_service import get_role_id_by_designation
-from utils.firebase_utils import firebase_login_with_email
+from utils.firebase_utils import firebase_login_with_email, get_http_client
 from core.config import settings
 from core.firebase import db
 from core.security import verify_firebase_token
@@ -110,7 +109,7 @@ async def signup_page(auth_data: SignUpSchema):
 async def login_page(user_data: LoginSchema):
     """[Public] Login for all users (student, faculty, admin)"""
     try:
-        creds = firebase_login_with_email(user_data.email, user_data.password)
+        creds = await firebase_login_with_email(user_data.email, user_data.password)
         uid = creds.get("localId")
         if not uid:
             raise HTTPException(status_code=400, detail="Login failed, no UID returned.")
@@ -181,7 +180,7 @@ async def refresh_token(request: Request):
     
     url = f"https://securetoken.googleapis.com/v1/token?key={settings.FIREBASE_API_KEY}"
     data = {"grant_type": "refresh_token", "refresh_token": refresh_tok}
-    res = requests.post(url, data=data, timeout=10)
+    res = await get_http_client().post(url, data=data)
     
     if res.status_code != 200:
         raise HTTPException(status_code=401, detail="Invalid or expired refresh token")
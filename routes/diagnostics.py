@@ -11,6 +11,7 @@ from core.security import allowed_users
 
 # --- NEW: Import the enhanced recommender service ---
 from services.recommender import generate_recommendations_from_diagnostic
+from services.diagnostic_analytics import get_subject_diagnostic_summary
 
 router = APIRouter(prefix="/diagnostics", tags=["Diagnostic Assessments"])
 
@@ -151,8 +152,6 @@ async def get_subject_diagnostic_analytics(
     [Faculty/Admin] Get aggregated diagnostic performance for a subject.
     Shows which TOS topics students are struggling with most.
     """
-    from services.diagnostic_analytics import get_subject_diagnostic_summary
-    
     try:
         summary = await get_subject_diagnostic_summary(subject_id)
         return summary
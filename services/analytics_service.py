@@ -19,7 +19,8 @@ def safe_float(val):
 def get_current_iso_time():
     return datetime.utcnow().isoformat()
 
-def apply_prediction_logic(analytics_data: dict):
+def apply_prediction_logic(analytics_data: dict, now_iso: str | None = None):
+    """Adds the pass/fail prediction; 'now_iso' lets a batch of reports share one timestamp."""
     summary = analytics_data.get("summary", {})
     
     current_score = safe_float(summary.get("average_score", 0))
@@ -51,7 +52,7 @@ def apply_prediction_logic(analytics_data: dict):
         "confidence_score": safe_float(probability),
         "risk_factors": risk_factors,
         "predicted_score": current_score,
-        "last_updated": get_current_iso_time()
+        "last_updated": now_iso or get_current_iso_time()
     }
     return analytics_data 
 
@@ -137,15 +138,20 @@ async def get_global_analytics_report():
         predictions_list = []
         
         # --- FIX 2: AGGREGATE GLOBAL BLOOM DATA ---
-        global_bloom_scores = defaultdict(list)
+        # Running (sum, count) per level, so no per-level score lists are kept
+        global_bloom_sum = defaultdict(float)
+        global_bloom_count = defaultdict(int)
+        # Every prediction in this report is made at the same moment
+        now_iso = get_current_iso_time()
         
         for i, analytics_data in enumerate(all_analytics_results):
-            apply_prediction_logic(analytics_data)
+            apply_prediction_logic(analytics_data, now_iso)
             student_doc = all_students[i].to_dict()
             
             # Collect scores for global average
             for bloom, score in analytics_data.get("performance_by_bloom", {}).items():
-                global_bloom_scores[bloom].append(score)
+                global_bloom_sum[bloom] += score
+                global_bloom_count[bloom] += 1
 
             predictions_list.append({
                 "student_id": analytics_data["student_id"],
@@ -161,7 +167,7 @@ async def get_global_analytics_report():
         pass_rate = safe_float((pass_count / total_students) * 100) if total_students > 0 else 0.0
 
         # Calculate class averages
-        global_bloom_avg = {k: safe_float(sum(v)/len(v)) for k, v in global_bloom_scores.items()}
+        global_bloom_avg = {k: safe_float(total / global_bloom_count[k]) for k, total in global_bloom_sum.items()}
 
         return {
             "summary": {
@@ -29,36 +29,45 @@ async def get_subject_diagnostic_summary(subject_id: str) -> Dict[str, Any]:
             "tos_topic_performance": []
         }
     
-    # Aggregate data
+    # Aggregate data in one pass, keeping running sums and counts instead of
+    # per-topic / per-bloom score lists
     total_students = len(all_results)
-    total_score = sum(r.overall_score for r in all_results)
-    passed = sum(1 for r in all_results if r.passing_status == "passed")
-    
-    # Aggregate TOS topic performance
-    topic_stats = defaultdict(lambda: {"scores": [], "bloom_breakdown": defaultdict(list)})
+    total_score = 0.0
+    passed = 0
+    topic_sum = defaultdict(float)
+    topic_count = defaultdict(int)
+    bloom_sum = defaultdict(float)    # (topic, bloom) -> sum of scores
+    bloom_count = defaultdict(int)    # (topic, bloom) -> number of scores
     
     for result in all_results:
+        total_score += result.overall_score
+        if result.passing_status == "passed":
+            passed += 1
+        
         for tos_perf in result.tos_performance:
-            topic_stats[tos_perf.topic_title]["scores"].append(tos_perf.score_percentage)
+            topic = tos_perf.topic_title
+            topic_sum[topic] += tos_perf.score_percentage
+            topic_count[topic] += 1
             
             # Aggregate Bloom's performance
             for bloom, score in tos_perf.bloom_breakdown.items():
-                topic_stats[tos_perf.topic_title]["bloom_breakdown"][bloom].append(score)
+                bloom_sum[(topic, bloom)] += score
+                bloom_count[(topic, bloom)] += 1
     
     # Calculate averages
+    bloom_avgs_by_topic = defaultdict(dict)
+    for (topic, bloom), score_sum in bloom_sum.items():
+        bloom_avgs_by_topic[topic][bloom] = round(score_sum / bloom_count[(topic, bloom)], 2)
+    
     tos_topic_performance = []
-    for topic, data in topic_stats.items():
-        avg_score = sum(data["scores"]) / len(data["scores"])
-        
-        bloom_avgs = {}
-        for bloom, scores in data["bloom_breakdown"].items():
-            bloom_avgs[bloom] = round(sum(scores) / len(scores), 2)
+    for topic, score_sum in topic_sum.items():
+        avg_score = score_sum / topic_count[topic]
         
         tos_topic_performance.append({
             "topic_title": topic,
             "avg_score": round(avg_score, 2),
-            "student_count": len(data["scores"]),
-            "bloom_performance": bloom_avgs,
+            "student_count": topic_count[topic],
+            "bloom_performance": bloom_avgs_by_topic.get(topic, {}),
             "difficulty_level": "high" if avg_score < 60 else "medium" if avg_score < 75 else "low"
         })
     
@@ -27,6 +27,10 @@ class FirestoreModelService:
         self.model: Type[ModelType] = model
         self.db = db.collection(self.collection_name)
         self._has_timestamps = issubclass(self.model, TimestampModel)
+        # The soft-delete filters never change, so build them once and
+        # reuse them in every query instead of per request.
+        self._not_deleted_filter = FieldFilter("deleted", "!=", True)
+        self._deleted_only_filter = FieldFilter("deleted", "==", True)
 
     async def get_all(
         self, 
@@ -47,9 +51,9 @@ class FirestoreModelService:
             if self._has_timestamps:
                 # This query is efficient because it's only on one field
                 if deleted_status == "non-deleted":
-                    query = query.where(filter=FieldFilter("deleted", "!=", True))
+                    query = query.where(filter=self._not_deleted_filter)
                 elif deleted_status == "deleted-only":
-                    query = query.where(filter=FieldFilter("deleted", "==", True))
+                    query = query.where(filter=self._deleted_only_filter)
             
             # --- NEW: Pagination Logic ---
             if start_after:
@@ -106,14 +110,22 @@ class FirestoreModelService:
         
         return await asyncio.to_thread(_get_sync)
 
+    def prepare(self, data: CreateSchemaType, created_at: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Dumps a 'Base' model into the dict that gets written on create.
+        'created_at' defaults to the current time.
+        """
+        data_dict = data.model_dump(exclude_none=True)
+        
+        if self._has_timestamps:
+            data_dict["created_at"] = created_at or get_current_iso_time()
+            data_dict["deleted"] = False
+        return data_dict
+
     async def create(self, data: CreateSchemaType, doc_id: Optional[str] = None) -> ModelType:
         """Creates a new document from a 'Base' model."""
         def _create_sync():
-            data_dict = data.model_dump(exclude_none=True)
-            
-            if self._has_timestamps:
-                data_dict["created_at"] = get_current_iso_time()
-                data_dict["deleted"] = False
+            data_dict = self.prepare(data)
             
             if doc_id:
                 new_doc_ref = self.db.document(doc_id)
@@ -128,6 +140,54 @@ class FirestoreModelService:
             
         return await asyncio.to_thread(_create_sync)
 
+    async def create_many(
+        self,
+        items: List[CreateSchemaType],
+        doc_ids: Optional[List[str]] = None
+    ) -> List[ModelType]:
+        """
+        Creates many documents using batched writes instead of one
+        round-trip per document. Pass 'doc_ids' to choose the document IDs
+        (re-running with the same IDs overwrites instead of duplicating).
+        
+        Returns the created models (built from the written data, no re-read).
+        """
+        if doc_ids is None:
+            # Auto-IDs are generated client-side, no round-trip needed
+            doc_ids = [self.db.document().id for _ in items]
+        elif len(doc_ids) != len(items):
+            raise ValueError(f"Got {len(doc_ids)} doc_ids for {len(items)} items")
+        elif len(set(doc_ids)) != len(doc_ids):
+            raise ValueError("doc_ids must be unique")
+        
+        # Documents written together share one creation timestamp
+        created_at = get_current_iso_time()
+        docs = {doc_id: self.prepare(item, created_at) for doc_id, item in zip(doc_ids, items)}
+        await self.write_many(docs)
+        return [
+            self.model.model_validate({**data_dict, "id": doc_id})
+            for doc_id, data_dict in docs.items()
+        ]
+
+    async def write_many(self, docs: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Writes already-prepared documents ({doc_id: data}) with batched
+        writes. Each chunk of up to 500 writes is committed as a single
+        batch, and chunks are committed concurrently.
+        """
+        def _commit_chunk_sync(chunk: List[Tuple[str, Dict[str, Any]]]):
+            batch = db.batch()
+            for doc_id, data_dict in chunk:
+                batch.set(self.db.document(doc_id), data_dict)
+            batch.commit()
+
+        # Firestore batches have a 500 operation limit
+        writes = list(docs.items())
+        chunks = [writes[i:i + 500] for i in range(0, len(writes), 500)]
+        await asyncio.gather(
+            *(asyncio.to_thread(_commit_chunk_sync, chunk) for chunk in chunks)
+        )
+
     async def delete(self, doc_id: str):
         """Soft-deletes a document (if supported), otherwise hard-deletes."""
         def _delete_sync():
@@ -212,7 +272,7 @@ class FirestoreModelService:
             
             # 2. Add the 'deleted' filter to the DATABASE QUERY
             if self._has_timestamps:
-                query = query.where(filter=FieldFilter("deleted", "!=", True))
+                query = query.where(filter=self._not_deleted_filter)
             
             # --- NEW: Pagination Logic ---
             if start_after:
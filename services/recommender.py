@@ -3,14 +3,96 @@
 # Updated recommendation engine that uses diagnostic results
 # ============================================================
 
-from typing import Any, Dict, List
+import asyncio
+import hashlib
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
 # --- FIX: Import the new models and service ---
-from database.models import RecommendationBase, Recommendation
+from database.models import RecommendationBase, Recommendation, get_current_iso_time
 from services import module_service, quiz_service
 from services import diagnostic_result_service, recommendation_service
 # --- END FIX ---
 from datetime import datetime
 
+# ------------------------------------------------------------
+# Background writer
+# ------------------------------------------------------------
+# Recommendation writes are pushed onto a bounded queue and drained in
+# batches by a background task (started in the app lifespan), so callers
+# don't wait on Firestore. Without a running writer (e.g. in scripts) the
+# writes happen inline.
+WRITE_QUEUE_MAXSIZE = 1000
+# Callers already got the docs back, so a failed batch is retried (doc IDs
+# are deterministic, so rewriting is safe) before it is given up on
+WRITE_RETRIES = 3
+WRITE_RETRY_BASE_DELAY_SECONDS = 0.5
+
+_write_queue: Optional[asyncio.Queue] = None
+_writer_task: Optional[asyncio.Task] = None
+
+
+def _recommendation_doc_id(user_id: str, diagnostic_result_id: str, topic_title: str) -> str:
+    """Deterministic ID so a retried request overwrites instead of duplicating."""
+    key = f"{user_id}:{diagnostic_result_id}:{topic_title}"
+    return hashlib.sha1(key.encode()).hexdigest()[:20]
+
+
+async def _write_with_retry(docs: Dict[str, dict]):
+    for attempt in range(WRITE_RETRIES + 1):
+        try:
+            await recommendation_service.write_many(docs)
+            return
+        except Exception as e:
+            if attempt == WRITE_RETRIES:
+                print(f"Error saving recommendations, dropped {len(docs)} docs {sorted(docs)}: {e}")
+                return
+            delay = WRITE_RETRY_BASE_DELAY_SECONDS * 2 ** attempt
+            print(f"Error saving {len(docs)} recommendations ({e}). Retrying in {delay}s...")
+            await asyncio.sleep(delay)
+
+
+async def _drain_write_queue():
+    while True:
+        doc_id, data = await _write_queue.get()
+        docs = {doc_id: data}
+        taken = 1
+        # Firestore batches have a 500 operation limit
+        while taken < 500 and not _write_queue.empty():
+            doc_id, data = _write_queue.get_nowait()
+            docs[doc_id] = data
+            taken += 1
+        
+        try:
+            await _write_with_retry(docs)
+        finally:
+            for _ in range(taken):
+                _write_queue.task_done()
+
+
+def start_recommendation_writer():
+    """Starts the background recommendation writer (call from app startup)."""
+    global _write_queue, _writer_task
+    if _writer_task is not None:
+        return
+    _write_queue = asyncio.Queue(maxsize=WRITE_QUEUE_MAXSIZE)
+    _writer_task = asyncio.create_task(_drain_write_queue())
+
+
+async def stop_recommendation_writer():
+    """Flushes pending writes and stops the writer (call from app shutdown)."""
+    global _write_queue, _writer_task
+    if _writer_task is None:
+        return
+    await _write_queue.join()
+    _writer_task.cancel()
+    try:
+        await _writer_task
+    except asyncio.CancelledError:
+        pass
+    _write_queue = None
+    _writer_task = None
+
+
 async def generate_recommendations_from_diagnostic(diagnostic_result_id: str) -> List[Dict[str, Any]]:
     """
     Generates personalized recommendations based on diagnostic test results.
@@ -20,43 +102,51 @@ async def generate_recommendations_from_diagnostic(diagnostic_result_id: str) ->
     if not result:
         return []
     
-    recommendations = []
+    # Only recommend for topics scored below 75%. Students who passed
+    # every topic exit here without touching modules/quizzes at all.
+    weak_topics = [t for t in result.tos_performance if t.score_percentage < 75.0]
+    if not weak_topics:
+        return []
+    
+    # The candidate modules/quizzes depend only on the subject, so fetch
+    # them once instead of once per weak topic.
+    (matching_modules, _), (matching_quizzes, _) = await asyncio.gather(
+        module_service.where("subject_id", "==", result.subject_id, limit=100),
+        quiz_service.where("subject_id", "==", result.subject_id, limit=100)
+    )
+    
+    # Index the candidates by Bloom's level (with lowercased titles) once,
+    # so each weak topic only scans the candidates at its own level.
+    modules_by_bloom = defaultdict(list)
+    for m in matching_modules:
+        modules_by_bloom[m.bloom_level].append((m, m.title.lower()))
+    quizzes_by_bloom = defaultdict(list)
+    for q in matching_quizzes:
+        quizzes_by_bloom[q.bloom_level].append((q, (q.topic_title or "").lower()))
+    
+    rec_payloads = []
+    # One timestamp for every recommendation generated from this result
+    now_iso = datetime.utcnow().isoformat()
     
     # 2. For each weak TOS topic, recommend relevant modules/quizzes
-    for tos_perf in result.tos_performance:
-        # Only recommend if score is below 75%
-        if tos_perf.score_percentage >= 75.0:
-            continue
-        
+    for tos_perf in weak_topics:
         # Find the weakest Bloom's level for this topic
         weakest_bloom = min(tos_perf.bloom_breakdown.items(), key=lambda x: x[1])
         bloom_level = weakest_bloom[0]
         bloom_score = weakest_bloom[1]
         
         # 3. Find modules that match this TOS topic + Bloom's level
-        matching_modules, _ = await module_service.where(
-            "subject_id", "==", result.subject_id,
-            limit=100
-        )
-        
         # Filter by title (simple keyword matching for demo)
         topic_keywords = tos_perf.topic_title.lower().split()
         relevant_modules = [
-            m for m in matching_modules
-            if any(kw in m.title.lower() for kw in topic_keywords) 
-            and m.bloom_level == bloom_level
+            m for m, title in modules_by_bloom.get(bloom_level, ())
+            if any(kw in title for kw in topic_keywords)
         ]
         
         # 4. Find matching quizzes
-        matching_quizzes, _ = await quiz_service.where(
-            "subject_id", "==", result.subject_id,
-            limit=100
-        )
-        
         relevant_quizzes = [
-            q for q in matching_quizzes
-            if any(kw in (q.topic_title or "").lower() for kw in topic_keywords)
-            and q.bloom_level == bloom_level
+            q for q, topic_title in quizzes_by_bloom.get(bloom_level, ())
+            if any(kw in topic_title for kw in topic_keywords)
         ]
         
         # 5. Determine priority
@@ -79,15 +169,35 @@ async def generate_recommendations_from_diagnostic(diagnostic_result_id: str) ->
             ),
             diagnostic_result_id=diagnostic_result_id,
             confidence=0.90,
-            timestamp=datetime.utcnow().isoformat()
+            timestamp=now_iso
         )
         # --- END FIX ---
-        
+        rec_payloads.append(rec_payload)
+    
+    if not rec_payloads:
+        return []
+    
+    doc_ids = [
+        _recommendation_doc_id(p.user_id, diagnostic_result_id, p.recommended_topic)
+        for p in rec_payloads
+    ]
+    
+    # 7a. No background writer: save all recommendations in one batched write
+    if _write_queue is None:
         try:
-            # --- FIX: Use recommendation_service ---
-            new_rec = await recommendation_service.create(rec_payload)
-            recommendations.append(new_rec.model_dump())
+            new_recs = await recommendation_service.create_many(rec_payloads, doc_ids=doc_ids)
         except Exception as e:
-            print(f"Error saving recommendation: {e}")
+            print(f"Error saving recommendations: {e}")
+            return []
+        return [rec.model_dump() for rec in new_recs]
+    
+    # 7b. Hand the writes to the background writer and answer right away
+    # Like create_many, the recommendations written together share one created_at
+    created_at = get_current_iso_time()
+    recommendations = []
+    for doc_id, payload in zip(doc_ids, rec_payloads):
+        data = recommendation_service.prepare(payload, created_at)
+        await _write_queue.put((doc_id, data))
+        recommendations.append(Recommendation.model_validate({**data, "id": doc_id}).model_dump())
     
     return recommendations
\ No newline at end of file
@@ -1,22 +1,64 @@
 # services/role_service.py
 from core.firebase import db
 import asyncio
-from google.cloud.firestore_v1.base_query import FieldFilter # Import FieldFilter
+import time
+
+# How long to wait before reloading the roles after a designation was not found
+ROLE_MISS_TTL_SECONDS = 30
+
+# The roles collection is tiny and effectively static, so it is loaded once
+# into a designation -> role ID index and every lookup is a dict hit.
+_ROLE_ID_BY_DESIGNATION: dict[str, str] = {}
+_roles_loaded_at: float | None = None
+_roles_lock = asyncio.Lock()
+
+
+def _load_roles_sync() -> dict[str, str]:
+    roles = {}
+    for doc in db.collection("roles").stream():
+        designation = (doc.to_dict() or {}).get("designation")
+        if designation:
+            roles[designation] = doc.id
+    return roles
+
+
+async def _ensure_roles_loaded(force: bool = False):
+    """Loads the roles collection once (or again when 'force' is set)."""
+    global _roles_loaded_at
+    if _roles_loaded_at is not None and not force:
+        return
+
+    async with _roles_lock:
+        # Another caller may have loaded them while we waited
+        if _roles_loaded_at is not None and not force:
+            return
+        roles = await asyncio.to_thread(_load_roles_sync)
+        _ROLE_ID_BY_DESIGNATION.clear()
+        _ROLE_ID_BY_DESIGNATION.update(roles)
+        _roles_loaded_at = time.monotonic()
+
+
+async def preload_roles():
+    """Warms the role index (e.g. at startup) so the first lookup doesn't pay for the read."""
+    try:
+        await _ensure_roles_loaded()
+    except Exception as e:
+        # Lookups load the roles on demand, so a failed warm-up is not fatal
+        print(f"Warning: could not preload roles: {e}")
+
 
 async def get_role_id_by_designation(designation: str) -> str | None:
     """
     Fetches the Firestore document ID for a role based on its designation.
     e.g., get_role_id_by_designation("student") -> "Tzc78QtZcaVbzFtpHoOL"
     """
-    def _fetch_role():
-        # --- FIX: Use 'filter' keyword to remove UserWarning ---
-        roles_query = db.collection("roles").where(
-            filter=FieldFilter("designation", "==", designation)
-        ).limit(1).stream()
-        
-        for doc in roles_query:
-            return doc.id
-        return None
-
-    role_id = await asyncio.to_thread(_fetch_role)
-    return role_id
\ No newline at end of file
+    await _ensure_roles_loaded()
+    role_id = _ROLE_ID_BY_DESIGNATION.get(designation)
+
+    # A role created after the load (e.g. by the seeding scripts) is picked
+    # up by reloading, but at most once per ROLE_MISS_TTL_SECONDS.
+    if role_id is None and time.monotonic() - _roles_loaded_at >= ROLE_MISS_TTL_SECONDS:
+        await _ensure_roles_loaded(force=True)
+        role_id = _ROLE_ID_BY_DESIGNATION.get(designation)
+
+    return role_id
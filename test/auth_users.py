@@ -0,0 +1,54 @@
+# test/auth_users.py
+"""
+Firebase Auth accounts for the seeded demo students, shared by the seeding
+scripts. Every account is created through import_users rather than one
+create_user round-trip per student.
+"""
+import functools
+import hashlib
+
+from firebase_admin import auth
+
+# All demo students share one password, so its hash is computed once
+DEMO_PASSWORD = "demo123"
+_DEMO_PASSWORD_SALT = b"cognify-demo-salt"
+_SCRYPT_N, _SCRYPT_R, _SCRYPT_P, _SCRYPT_DKLEN = 16384, 8, 1, 64
+
+# Firebase Auth limit on records per import_users call
+MAX_IMPORT_USERS = 1000
+
+
+@functools.cache
+def _demo_password_hash() -> bytes:
+    return hashlib.scrypt(
+        DEMO_PASSWORD.encode(), salt=_DEMO_PASSWORD_SALT,
+        n=_SCRYPT_N, r=_SCRYPT_R, p=_SCRYPT_P, dklen=_SCRYPT_DKLEN
+    )
+
+
+def create_auth_users(students):
+    """Creates (or overwrites) Auth accounts for (uid, persona) pairs via import_users."""
+    password_hash = _demo_password_hash()
+    records = [
+        auth.ImportUserRecord(
+            uid=uid,
+            email=student.email,
+            display_name=student.name,
+            password_hash=password_hash,
+            password_salt=_DEMO_PASSWORD_SALT
+        )
+        for uid, student in students
+    ]
+    hash_alg = auth.UserImportHash.standard_scrypt(
+        memory_cost=_SCRYPT_N, parallelization=_SCRYPT_P,
+        block_size=_SCRYPT_R, derived_key_length=_SCRYPT_DKLEN
+    )
+    # import_users takes up to MAX_IMPORT_USERS records per call
+    imported = 0
+    for start in range(0, len(records), MAX_IMPORT_USERS):
+        chunk = records[start:start + MAX_IMPORT_USERS]
+        result = auth.import_users(chunk, hash_alg=hash_alg)
+        imported += result.success_count
+        for err in result.errors:
+            print(f"   > Auth: ⚠️  {chunk[err.index].email}: {err.reason}")
+    print(f"   > Auth: ✅ Imported {imported} students (password: {DEMO_PASSWORD})")
@@ -0,0 +1,265 @@
+# test/batch_writer.py
+"""Buffers Firestore writes from the seeding scripts into WriteBatch commits."""
+import itertools
+import os
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import firebase_admin
+import requests
+from google.api_core.exceptions import Aborted, DeadlineExceeded, ServiceUnavailable
+from google.cloud import firestore
+from google.cloud.firestore_v1.bulk_writer import BulkWriterOptions
+
+from core.firebase import db, FIRESTORE_DATABASE
+from core.firestore_rest import RestBatchWriter
+
+# Firestore rejects a batch with more than 500 writes (or over 10 MiB); the
+# seed documents are small, so batches are filled to the op limit unless
+# SEED_BATCH_OPS asks for smaller ones
+FIRESTORE_MAX_BATCH_OPS = 500
+MAX_BATCH_OPS = min(int(os.getenv("SEED_BATCH_OPS", FIRESTORE_MAX_BATCH_OPS)), FIRESTORE_MAX_BATCH_OPS)
+# Batches are independent, so several commits can be in flight at once.
+# Past a few dozen, extra in-flight commits only queue on the clients'
+# channels and contend server-side, so SEED_COMMIT_WORKERS is capped.
+MAX_COMMIT_WORKERS = 32
+COMMIT_WORKERS = max(1, min(int(os.getenv("SEED_COMMIT_WORKERS", 20)), MAX_COMMIT_WORKERS))
+# One Firestore client has one gRPC channel, whose stream limit caps how many
+# commits actually run in parallel; the workers share this many clients
+CLIENT_POOL_SIZE = int(os.getenv("SEED_CLIENT_POOL", 8))
+COMMIT_RETRIES = 3
+# "rest" commits through the REST documents:batchWrite endpoint instead of
+# the SDK; the SDK stays the fallback if REST access is blocked. "bulk"
+# hands single writes to the SDK's BulkWriter (its own batching, parallelism
+# and retries); set_all() groups of several writes still get an atomic batch.
+WRITE_MODE = os.getenv("SEED_WRITE_MODE", "sdk").lower()
+# BulkWriter's default options cap it at 500 writes/s
+BULK_OPS_PER_SECOND = int(os.getenv("SEED_BULK_OPS_PER_SECOND", 5000))
+# A partially filled batch is submitted once it is this old, so commits
+# start while documents are still being built instead of only every 500
+MAX_BATCH_AGE_SECONDS = 1.0
+
+# HTTP statuses meaning the REST endpoint is not usable for this run (no
+# access / no such database), as opposed to a problem with one batch
+REST_UNAVAILABLE_STATUS_CODES = frozenset({401, 403, 404})
+
+# Contention / transient errors that concurrent commits can hit
+_RETRYABLE_ERRORS = (Aborted, DeadlineExceeded, ServiceUnavailable)
+
+def _make_client_pool(size: int) -> list:
+    """The shared client plus 'size' - 1 extra clients on the same credentials and database."""
+    credentials = firebase_admin.get_app().credential.get_credential()
+    return [db] + [
+        firestore.Client(project=db.project, credentials=credentials, database=FIRESTORE_DATABASE)
+        for _ in range(size - 1)
+    ]
+
+def _collection(client, name, col_refs):
+    """Returns the client's CollectionReference for 'name', cached in 'col_refs'."""
+    col_ref = col_refs.get(name)
+    if col_ref is None:
+        col_ref = col_refs[name] = client.collection(name)
+    return col_ref
+
+def _commit_with_retry(client, writes, retry_count=COMMIT_RETRIES, col_refs=None):
+    """'col_refs' caches the client's collection references across calls."""
+    if col_refs is None:
+        col_refs = {}
+    batch = client.batch()
+    for collection, doc_id, data in writes:
+        batch.set(_collection(client, collection, col_refs).document(doc_id), data)
+
+    for attempt in range(retry_count + 1):
+        try:
+            return batch.commit()
+        except _RETRYABLE_ERRORS as e:
+            if attempt == retry_count:
+                raise
+            # Jittered so commits that failed together don't all retry together
+            delay = round(0.5 * 2 ** attempt * random.uniform(0.5, 1.5), 2)
+            print(f"   ⚠️  Batch commit failed ({e.__class__.__name__}). Retrying in {delay}s...")
+            time.sleep(delay)
+
+class BatchWriter:
+    """
+    Collects set() calls into batches and commits one every 'max_ops'
+    writes, so N documents cost N / 500 round-trips instead of N.
+    Commits run on a thread pool while the caller keeps building documents,
+    with at most two batches per worker queued before set() waits (so memory
+    stays bounded). Each worker thread sticks to one client from a small
+    pool. Call join() once at the end to commit the remainder and wait for all.
+    """
+
+    def __init__(
+        self,
+        client=None,
+        max_ops: int = MAX_BATCH_OPS,
+        workers: int = COMMIT_WORKERS,
+        max_age: float = MAX_BATCH_AGE_SECONDS,
+        pool_size: int = CLIENT_POOL_SIZE,
+        mode: str = WRITE_MODE
+    ):
+        # An explicit client is used as-is, without extra pooled clients
+        self._clients = [client] if client else _make_client_pool(max(1, min(pool_size, workers)))
+        self._next_client = itertools.cycle(self._clients)
+        self._client_lock = threading.Lock()
+        self._local = threading.local()
+        self._use_rest = mode == "rest"
+        self._rest_lock = threading.Lock()
+        self._bulk = None
+        self._bulk_failures = []
+        self._bulk_col_refs = {}
+        if mode == "bulk":
+            self._bulk = self._clients[0].bulk_writer(options=BulkWriterOptions(
+                initial_ops_per_second=BULK_OPS_PER_SECOND,
+                max_ops_per_second=BULK_OPS_PER_SECOND,
+            ))
+            self._bulk.on_write_error(self._on_bulk_error)
+        self.max_ops = max_ops
+        self.max_age = max_age
+        self.max_pending = 2 * workers
+        self.committed = 0
+        self._writes = []
+        self._started_at = time.monotonic()
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._futures = []
+
+    def _thread_client(self):
+        client = getattr(self._local, "client", None)
+        if client is None:
+            with self._client_lock:
+                client = self._local.client = next(self._next_client)
+        return client
+
+    def _thread_col_refs(self):
+        # Collection references belong to a client, and each thread has one
+        col_refs = getattr(self._local, "col_refs", None)
+        if col_refs is None:
+            col_refs = self._local.col_refs = {}
+        return col_refs
+
+    def _thread_rest_writer(self):
+        rest = getattr(self._local, "rest", None)
+        if rest is None:
+            rest = self._local.rest = RestBatchWriter(database=FIRESTORE_DATABASE)
+        return rest
+
+    def _on_bulk_error(self, failure, bulk_writer) -> bool:
+        """BulkWriter error callback: retry up to COMMIT_RETRIES times, then record the failure."""
+        if failure.attempts <= COMMIT_RETRIES:
+            return True
+        self._bulk_failures.append(failure)
+        return False
+
+    def _disable_rest(self, reason):
+        """Switches every worker to the SDK; only the first caller does (and logs) it."""
+        with self._rest_lock:
+            if not self._use_rest:
+                return
+            self._use_rest = False
+        print(f"   ⚠️  REST batchWrite unavailable ({reason}). Falling back to the SDK.")
+
+    def _commit(self, writes):
+        if self._use_rest:
+            try:
+                writes = self._thread_rest_writer().batch_write(writes)
+            except requests.ConnectionError as e:
+                self._disable_rest(e)
+            except requests.HTTPError as e:
+                if e.response is not None and e.response.status_code in REST_UNAVAILABLE_STATUS_CODES:
+                    self._disable_rest(e)
+                else:
+                    # A problem with this batch (e.g. a 400), not with REST
+                    # access: report it and commit just this batch via the SDK
+                    print(f"   ⚠️  REST batchWrite failed ({e}). Committing this batch via the SDK.")
+            except requests.RequestException as e:
+                # e.g. a read timeout: also only this batch's problem
+                print(f"   ⚠️  REST batchWrite failed ({e}). Committing this batch via the SDK.")
+            else:
+                if not writes:
+                    return
+                # Retry the individually rejected writes through the SDK
+                print(f"   ⚠️  REST batchWrite rejected {len(writes)} writes. Retrying them via the SDK.")
+        return _commit_with_retry(self._thread_client(), writes, col_refs=self._thread_col_refs())
+
+    def set(self, collection: str, doc_id: str, data: dict):
+        self.set_all(((collection, doc_id, data),))
+
+    def set_all(self, writes):
+        """
+        Queues (collection, doc_id, data) writes so they land in the same
+        batch, i.e. they are committed together or not at all.
+        """
+        writes = list(writes)
+        if self._bulk is not None and len(writes) == 1:
+            # BulkWriter gives no atomicity across writes, so only lone
+            # writes go through it; groups fall through to a WriteBatch
+            collection, doc_id, data = writes[0]
+            self._bulk.set(_collection(self._clients[0], collection, self._bulk_col_refs).document(doc_id), data)
+            self.committed += 1
+            return
+        if len(writes) > self.max_ops:
+            raise ValueError(f"{len(writes)} writes do not fit in one batch of {self.max_ops}")
+        if len(self._writes) + len(writes) > self.max_ops:
+            self.flush()
+        if not self._writes:
+            self._started_at = time.monotonic()
+        self._writes.extend(writes)
+        if len(self._writes) >= self.max_ops or time.monotonic() - self._started_at >= self.max_age:
+            self.flush()
+
+    def set_chunked(self, writes):
+        """
+        Like set_all(), but a group larger than one batch is split into
+        'max_ops'-sized chunks, each committed atomically on its own.
+        """
+        writes = list(writes)
+        if len(writes) > self.max_ops:
+            print(f"   ⚠️  {len(writes)} writes exceed one batch; committing them in chunks of {self.max_ops}.")
+        for start in range(0, len(writes), self.max_ops):
+            self.set_all(writes[start:start + self.max_ops])
+
+    def flush(self):
+        """Submits the pending writes, if any, for commit and starts a new batch."""
+        if not self._writes:
+            return
+        # Forget finished commits (re-raising a failed one right away) so
+        # only in-flight futures are kept and scanned here
+        pending = []
+        for future in self._futures:
+            if not future.done():
+                pending.append(future)
+            elif future.exception() is not None:
+                raise future.exception()
+        if len(pending) >= self.max_pending:
+            # Back-pressure: let a commit finish before queueing another
+            wait(pending, return_when=FIRST_COMPLETED)
+        pending.append(self._executor.submit(self._commit, self._writes))
+        self._futures = pending
+        self.committed += len(self._writes)
+        self._writes = []
+
+    def join(self):
+        """Commits the remainder and blocks until every submitted batch is written."""
+        if self._bulk is not None:
+            self._bulk.flush()
+            if self._bulk_failures:
+                failure = self._bulk_failures[0]
+                raise RuntimeError(
+                    f"{len(self._bulk_failures)} bulk writes failed, e.g. "
+                    f"{failure.operation.reference.path}: {failure.message}"
+                )
+        self.flush()
+        futures, self._futures = self._futures, []
+        wait(futures)
+        for future in futures:
+            # Re-raise the first failed commit
+            future.result()
+
+    def close(self):
+        self.join()
+        if self._bulk is not None:
+            self._bulk.close()
+        self._executor.shutdown()
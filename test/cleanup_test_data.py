@@ -1,74 +1,224 @@
+"""
+Removes test data: Firestore documents and Firebase Auth users whose IDs
+start with TEST_PREFIX.
+
+Test documents are found with a range query on the document key
+(__name__). Firestore indexes document keys automatically, so no entries in
+firestore.indexes.json (and no `firebase deploy --only firestore:indexes`)
+are needed before running the cleanup, and there is no fallback that scans
+whole collections when an index is missing.
+"""
 import asyncio
+import logging
+import os
+import queue
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
 # Add project root to path to import core modules
 BASE_DIR = Path(__file__).resolve().parents[1]
 sys.path.append(str(BASE_DIR))
 
+from firebase_admin import auth
+from google.cloud.firestore_v1 import FieldPath
+from google.cloud.firestore_v1.bulk_writer import BulkWriterOptions
 from core.firebase import db
-from test.config import TEST_PREFIX
-
-# List of collections to check and clean
-# Added 'student_analytics_reports' and 'subjects' as requested
-COLLECTIONS_TO_CLEAN = [
-    "student_analytics_reports", 
-    "subjects",
-    "assessments",
-    "diagnostic_assessments",
-    "diagnostic_results",
-    "recommendations",
-    "activities",
-    "study_sessions",
-    "modules",
-    "quizzes",
-    "tos",
-    "user_profiles"
-]
-
-async def cleanup_test_data():
-    print(f"\n🧹 STARTING CLEANUP (Target Prefix: '{TEST_PREFIX}')...")
-    print("="*60)
-
-    total_deleted = 0
-
-    for collection_name in COLLECTIONS_TO_CLEAN:
-        print(f"   > Scanning collection: '{collection_name}'...")
-        
-        # Fetch all documents
-        # Note: Firestore queries by ID prefix aren't directly supported efficiently, 
-        # so we fetch and filter. For test data environments, this is acceptable.
-        docs = list(db.collection(collection_name).stream())
-        
-        batch = db.batch()
-        count = 0
+from test.config import TEST_PREFIX, TEST_PREFIX_END, TEST_PREFIXES, CLEANUP_COLLECTIONS, FULL_WIPE
+
+# Progress is logged through a QueueHandler: the scan workers only enqueue
+# records and a background QueueListener writes them to stdout, so the
+# concurrent scans never contend on the stdout lock.
+log = logging.getLogger("cleanup")
+log.setLevel(logging.INFO)
+log.propagate = False
+
+def _start_log_listener() -> QueueListener:
+    log_queue = queue.SimpleQueue()
+    log.handlers = [QueueHandler(log_queue)]
+    listener = QueueListener(log_queue, logging.StreamHandler(sys.stdout))
+    listener.start()
+    return listener
+
+# Keys are read one page at a time so large collections never sit in memory,
+# and deletes start while later pages are still being read.
+PAGE_SIZE = 5000
+# Once this many deletes are queued on the BulkWriter, wait for them to
+# commit before reading more pages (bounds the in-flight work).
+MAX_IN_FLIGHT = 7500
+# BulkWriter's default options start at (and cap at) 500 ops/s, which makes
+# the deletes, not the scans, the bottleneck. Test data lives in
+# dev/CI projects, so the cleanup runs at a fixed higher rate.
+CLEANUP_OPS_PER_SECOND = int(os.getenv("CLEANUP_OPS_PER_SECOND", "5000"))
+
+def _make_bulk_writer(client):
+    return client.bulk_writer(options=BulkWriterOptions(
+        initial_ops_per_second=CLEANUP_OPS_PER_SECOND,
+        max_ops_per_second=CLEANUP_OPS_PER_SECOND,
+    ))
+
+def _iter_test_doc_pages(col_ref):
+    """Yields pages of keys-only snapshots for the test documents in a collection."""
+    # Range query on the document key (__name__): it uses Firestore's
+    # built-in key ordering, so it works on every collection and needs no
+    # field index. select([]) is a keys-only projection: we only need
+    # doc.id/doc.reference.
+    query = (
+        col_ref.order_by(FieldPath.document_id())
+        .start_at({FieldPath.document_id(): col_ref.document(TEST_PREFIX)})
+        .end_before({FieldPath.document_id(): col_ref.document(TEST_PREFIX_END)})
+        .select([])
+        .limit(PAGE_SIZE)
+    )
+    page = list(query.stream())
+    while page:
+        yield page
+        if len(page) < PAGE_SIZE:
+            break
+        page = list(query.start_after(page[-1]).stream())
+
+async def _clean_collection(client, collection_name: str, bw) -> int:
+    """Scans one collection and queues its test documents on the BulkWriter."""
+    def _scan_sync():
         deleted_in_col = 0
-        
-        for doc in docs:
-            # SAFETY CHECK: Only delete documents starting with the test prefix (e.g., 'demo_')
-            if doc.id.startswith(TEST_PREFIX):
-                batch.delete(doc.reference)
-                count += 1
-                deleted_in_col += 1
-                total_deleted += 1
-                
-                # Commit in batches of 400 (Firestore limit is 500)
-                if count >= 400:
-                    batch.commit()
-                    batch = db.batch()
-                    count = 0
-        
-        # Commit remaining documents in the batch
-        if count > 0:
-            batch.commit()
+        in_flight = 0
+        for page in _iter_test_doc_pages(client.collection(collection_name)):
+            # The key-range query only returns IDs starting with the test
+            # prefix (e.g., 'demo_'), so no client-side check is needed.
+            for doc in page:
+                bw.delete(doc.reference)
+            deleted_in_col += len(page)
+            in_flight += len(page)
             
-        if deleted_in_col > 0:
-            print(f"     ✅ Deleted {deleted_in_col} test documents.")
+            if in_flight >= MAX_IN_FLIGHT:
+                bw.flush()
+                in_flight = 0
+        return deleted_in_col
+
+    deleted_in_col = await asyncio.to_thread(_scan_sync)
+    if deleted_in_col > 0:
+        log.info(f"   > '{collection_name}': ✅ Queued {deleted_in_col} test documents for deletion.")
+    else:
+        log.info(f"   > '{collection_name}': - No matching test data found.")
+    return deleted_in_col
+
+async def _wipe_collection(client, collection_name: str) -> int:
+    """Deletes every document (and subcollection) in a collection."""
+    # recursive_delete streams keys and deletes them through the given
+    # BulkWriter, closing it when done (so each call needs its own)
+    deleted_in_col = await asyncio.to_thread(
+        client.recursive_delete, client.collection(collection_name),
+        bulk_writer=_make_bulk_writer(client)
+    )
+    log.info(f"   > '{collection_name}': 🗑️  Wiped {deleted_in_col} documents.")
+    return deleted_in_col
+
+# auth.delete_users accepts at most 1000 UIDs per call
+AUTH_DELETE_CHUNK = 1000
+AUTH_DELETE_WORKERS = 10
+
+def _collect_test_uids():
+    """Lists every Firebase Auth user whose UID starts with the test prefix."""
+    uids = []
+    prefixes = TEST_PREFIXES
+    # Request the next page (1000 users per RPC) before filtering the current
+    # one, so the page fetch overlaps with the filtering.
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        page = auth.list_users()
+        while page:
+            next_page = executor.submit(page.get_next_page)
+            uids.extend(user.uid for user in page.users if user.uid.startswith(prefixes))
+            page = next_page.result()
+    return uids
+
+def _delete_auth_users_sync(uids):
+    """Deletes UIDs in 1000-UID chunks, several chunks in parallel. Returns (deleted, failed UIDs)."""
+    chunks = [uids[i:i + AUTH_DELETE_CHUNK] for i in range(0, len(uids), AUTH_DELETE_CHUNK)]
+    deleted = 0
+    failed = []
+    with ThreadPoolExecutor(max_workers=AUTH_DELETE_WORKERS) as executor:
+        for chunk, result in zip(chunks, executor.map(auth.delete_users, chunks)):
+            deleted += result.success_count
+            failed.extend(chunk[err.index] for err in result.errors)
+    return deleted, failed
+
+async def cleanup_auth_users() -> int:
+    """Removes the Firebase Auth accounts of test users."""
+    uids = await asyncio.to_thread(_collect_test_uids)
+    if not uids:
+        log.info("   > Auth: - No matching test users found.")
+        return 0
+
+    deleted, failed = await asyncio.to_thread(_delete_auth_users_sync, uids)
+    if failed:
+        # Retry the partial failures once
+        retried, failed = await asyncio.to_thread(_delete_auth_users_sync, failed)
+        deleted += retried
+
+    log.info(f"   > Auth: ✅ Deleted {deleted} test users.")
+    if failed:
+        log.info(f"   > Auth: ⚠️  Could not delete {len(failed)} users: {', '.join(failed)}")
+    return deleted
+
+async def _clean_collections(client, collections, bulk_writer=None):
+    """Deletes the TEST_PREFIX documents of 'collections'. Returns per-collection counts."""
+    # BulkWriter batches the deletes and commits them in parallel
+    # (with retries), so we just enqueue and flush once at the end.
+    # It is thread-safe, so all collection scans share it.
+    bw = bulk_writer or _make_bulk_writer(client)
+
+    # Scan every collection concurrently instead of one after another
+    counts = await asyncio.gather(
+        *(_clean_collection(client, name, bw) for name in collections)
+    )
+
+    await asyncio.to_thread(bw.flush)
+    if bulk_writer is None:
+        bw.close()
+    return counts
+
+async def cleanup_test_data(
+    collections=CLEANUP_COLLECTIONS,
+    cleanup_auth=True,
+    bulk_writer=None,
+    client=None,
+    full_wipe=FULL_WIPE
+):
+    """
+    Removes all test data from 'collections' (and the test Auth users when
+    'cleanup_auth' is set). Pass an existing 'bulk_writer' to share it with
+    other work (it is then flushed but not closed), or an existing Firestore
+    'client' to reuse its warm connection; defaults to the shared client
+    from core.firebase.
+
+    With 'full_wipe' (DESTRUCTIVE, dev/CI projects only) every document in
+    'collections' is deleted with recursive_delete, test prefix or not.
+    """
+    client = client or db
+    listener = _start_log_listener()
+    try:
+        if full_wipe:
+            log.info("\n🧹 STARTING CLEANUP (FULL WIPE of all documents)...")
         else:
-            print("     - No matching test data found.")
+            log.info(f"\n🧹 STARTING CLEANUP (Target Prefix: '{TEST_PREFIX}')...")
+        log.info("="*60)
+
+        if full_wipe:
+            counts = await asyncio.gather(
+                *(_wipe_collection(client, name) for name in collections)
+            )
+        else:
+            counts = await _clean_collections(client, collections, bulk_writer)
+        total_deleted = sum(counts)
+
+        if cleanup_auth:
+            await cleanup_auth_users()
 
-    print("="*60)
-    print(f"✨ CLEANUP COMPLETE! Total documents removed: {total_deleted}\n")
+        log.info("="*60)
+        log.info(f"✨ CLEANUP COMPLETE! Total documents removed: {total_deleted}\n")
+    finally:
+        listener.stop()
 
 if __name__ == "__main__":
     asyncio.run(cleanup_test_data())
\ No newline at end of file
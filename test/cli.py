@@ -1,26 +1,44 @@
 """Command-line interface for test data management."""
 import argparse
 import asyncio
-from .populate_test_data import populate_test_data
-from .cleanup_test_data import cleanup_test_data
+import importlib
+import os
+
+# action -> (module, function, banner). The chosen module is imported lazily
+# so a cleanup run doesn't pay for loading the populate script and vice versa.
+ACTIONS = {
+    "populate": ("test.populate_test_data", "populate_test_data", "\n📝 Starting test data population...\n"),
+    "realistic": ("test.realistic_populate", "populate_realistic_data", "\n📝 Starting realistic data population...\n"),
+    "cleanup": ("test.cleanup_test_data", "cleanup_test_data", "\n🧹 Starting test data cleanup...\n"),
+}
 
 def main():
     """Entry point for test data CLI."""
     parser = argparse.ArgumentParser(description="Cognify test data management")
     parser.add_argument(
         "action",
-        choices=["populate", "cleanup"],
-        help="Action to perform: populate (create test data) or cleanup (remove test data)"
+        choices=list(ACTIONS),
+        help="Action to perform: populate (create test data), realistic (create the "
+             "demo-ready dataset) or cleanup (remove test data)"
+    )
+
+    parser.add_argument(
+        "--write-mode",
+        choices=["sdk", "rest", "bulk"],
+        help="How populate/realistic commit their writes (sets SEED_WRITE_MODE): WriteBatch "
+             "commits (sdk, default), REST batchWrite (rest) or the SDK BulkWriter (bulk)"
     )
 
     args = parser.parse_args()
+    if args.write_mode:
+        # Read by test.batch_writer at import time, which happens lazily below
+        os.environ["SEED_WRITE_MODE"] = args.write_mode
 
-    if args.action == "populate":
-        print("\n📝 Starting test data population...\n")
-        asyncio.run(populate_test_data())
-    else:  # cleanup
-        print("\n🧹 Starting test data cleanup...\n")
-        asyncio.run(cleanup_test_data())
+    mod_name, fn_name, banner = ACTIONS[args.action]
+    print(banner)
+    # cleanup_test_data falls back to the shared core.firebase client itself
+    fn = getattr(importlib.import_module(mod_name), fn_name)
+    asyncio.run(fn())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
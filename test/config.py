@@ -1,16 +1,45 @@
 # test/config.py
 """
 Configuration for generating realistic test data.
+
+All tables are read-only: sequences are tuples, mappings are
+MappingProxyType views and records are frozen dataclasses / namedtuples.
 """
+import os
+import sys
+from types import MappingProxyType
+from typing import Final, NamedTuple
+
+TEST_PREFIX: Final = "demo_"
+# Exclusive upper bound of the TEST_PREFIX key range: the prefix with its last
+# character bumped ("demo_" -> "demo`"), so every ID starting with the prefix
+# sorts below it, whatever characters follow.
+TEST_PREFIX_END: Final = TEST_PREFIX[:-1] + chr(ord(TEST_PREFIX[-1]) + 1)
+# All prefixes that mark test data, for str.startswith checks
+TEST_PREFIXES: Final = (TEST_PREFIX,)
 
-TEST_PREFIX = "demo_"
+# Subject IDs, interned once and shared by SUBJECTS_DATA and MODULES_DATA
+SUBJ_PSYCH_ASSESSMENT: Final = sys.intern(f"{TEST_PREFIX}subj_psych_assessment")
+SUBJ_ABNORMAL_PSYCH: Final = sys.intern(f"{TEST_PREFIX}subj_abnormal_psych")
+SUBJ_DEV_PSYCH: Final = sys.intern(f"{TEST_PREFIX}subj_dev_psych")
+SUBJ_IO_PSYCH: Final = sys.intern(f"{TEST_PREFIX}subj_io_psych")
 
 # ============================================================
 # 1. SUBJECTS (Psychometrician Board Exam Core Subjects)
 # ============================================================
-SUBJECTS_DATA = [
+class SubjectData(NamedTuple):
+    id: str
+    subject_name: str
+    pqf_level: int
+    description: str
+    icon_name: str
+    icon_color: str
+    icon_bg_color: str
+    card_bg_color: str
+
+_RAW_SUBJECTS = (
     {
-        "id": f"{TEST_PREFIX}subj_psych_assessment",
+        "id": SUBJ_PSYCH_ASSESSMENT,
         "subject_name": "Psychological Assessment",
         "pqf_level": 7,
         "description": "Principles, methods, and tools for psychological evaluation and measurement.",
@@ -20,7 +49,7 @@ SUBJECTS_DATA = [
         "card_bg_color": "#FDFFB8"
     },
     {
-        "id": f"{TEST_PREFIX}subj_abnormal_psych",
+        "id": SUBJ_ABNORMAL_PSYCH,
         "subject_name": "Abnormal Psychology",
         "pqf_level": 7,
         "description": "Study of psychological disorders, maladaptive behaviors, and their classification.",
@@ -30,7 +59,7 @@ SUBJECTS_DATA = [
         "card_bg_color": "#E6F7F3"
     },
     {
-        "id": f"{TEST_PREFIX}subj_dev_psych",
+        "id": SUBJ_DEV_PSYCH,
         "subject_name": "Developmental Psychology",
         "pqf_level": 7,
         "description": "Human growth and changes across the lifespan from conception to death.",
@@ -40,7 +69,7 @@ SUBJECTS_DATA = [
         "card_bg_color": "#E2E6F2"
     },
     {
-        "id": f"{TEST_PREFIX}subj_io_psych",
+        "id": SUBJ_IO_PSYCH,
         "subject_name": "Industrial/Organizational Psychology",
         "pqf_level": 7,
         "description": "Application of psychological theories to workplace behavior and organizational settings.",
@@ -49,81 +78,113 @@ SUBJECTS_DATA = [
         "icon_bg_color": "#F9ECE3",
         "card_bg_color": "#F9ECE3"
     },
-]
+)
+
+SUBJECTS_DATA = tuple(SubjectData(**d) for d in _RAW_SUBJECTS)
+SUBJECTS_BY_ID = MappingProxyType({s.id: s for s in SUBJECTS_DATA})
 
 # ============================================================
 # 2. MODULES (Specific Content for each Subject)
 # ============================================================
 # Structure matches ModuleBase fields
-MODULES_DATA = {
-    f"{TEST_PREFIX}subj_psych_assessment": [
+class ModuleData(NamedTuple):
+    subject_id: str
+    title: str
+    bloom_level: str
+    material_type: str
+    estimated_time: int
+    purpose: str
+
+_RAW_MODULES = {
+    SUBJ_PSYCH_ASSESSMENT: (
         {"title": "Introduction to Psychological Testing", "bloom_level": "remembering", "material_type": "reading", "estimated_time": 60, "purpose": "Define basic concepts"},
         {"title": "Reliability and Validity", "bloom_level": "understanding", "material_type": "reading", "estimated_time": 90, "purpose": "Explain psychometric properties"},
         {"title": "Norms and Test Standardization", "bloom_level": "analyzing", "material_type": "reading", "estimated_time": 120, "purpose": "Analyze test data"},
         {"title": "Assessment Interviewing", "bloom_level": "applying", "material_type": "reading", "estimated_time": 45, "purpose": "Apply interviewing techniques"},
-    ],
-    f"{TEST_PREFIX}subj_abnormal_psych": [
+    ),
+    SUBJ_ABNORMAL_PSYCH: (
         {"title": "Models of Abnormality", "bloom_level": "understanding", "material_type": "reading", "estimated_time": 60, "purpose": "Understand theoretical frameworks"},
         {"title": "Anxiety and Phobias", "bloom_level": "analyzing", "material_type": "reading", "estimated_time": 90, "purpose": "Analyze anxiety disorders"},
         {"title": "Mood Disorders: Depression & Bipolar", "bloom_level": "evaluating", "material_type": "reading", "estimated_time": 120, "purpose": "Evaluate mood symptoms"},
         {"title": "Personality Disorders", "bloom_level": "remembering", "material_type": "reading", "estimated_time": 80, "purpose": "Recall personality clusters"},
-    ],
-    f"{TEST_PREFIX}subj_dev_psych": [
+    ),
+    SUBJ_DEV_PSYCH: (
         {"title": "Prenatal Development", "bloom_level": "remembering", "material_type": "reading", "estimated_time": 45, "purpose": "Recall prenatal stages"},
         {"title": "Piaget's Stages of Cognitive Development", "bloom_level": "understanding", "material_type": "reading", "estimated_time": 90, "purpose": "Explain cognitive growth"},
         {"title": "Erikson's Psychosocial Stages", "bloom_level": "analyzing", "material_type": "reading", "estimated_time": 90, "purpose": "Analyze psychosocial crises"},
         {"title": "Adolescence and Emerging Adulthood", "bloom_level": "evaluating", "material_type": "reading", "estimated_time": 60, "purpose": "Evaluate developmental tasks"},
-    ],
-    f"{TEST_PREFIX}subj_io_psych": [
+    ),
+    SUBJ_IO_PSYCH: (
         {"title": "Job Analysis and Selection", "bloom_level": "applying", "material_type": "reading", "estimated_time": 120, "purpose": "Apply selection methods"},
         {"title": "Performance Appraisal Systems", "bloom_level": "analyzing", "material_type": "reading", "estimated_time": 90, "purpose": "Analyze performance metrics"},
         {"title": "Motivation in the Workplace", "bloom_level": "understanding", "material_type": "reading", "estimated_time": 60, "purpose": "Understand motivation theories"},
         {"title": "Organizational Culture", "bloom_level": "evaluating", "material_type": "reading", "estimated_time": 75, "purpose": "Evaluate culture impact"},
-    ]
+    )
 }
 
+MODULES_DATA = tuple(
+    ModuleData(subject_id=subject_id, **d)
+    for subject_id, modules in _RAW_MODULES.items()
+    for d in modules
+)
+MODULES_BY_SUBJECT = MappingProxyType({
+    subject_id: tuple(m for m in MODULES_DATA if m.subject_id == subject_id)
+    for subject_id in SUBJECTS_BY_ID
+})
+
 # ============================================================
 # 3. STUDENT PERSONAS (For realistic score generation)
 # ============================================================
-STUDENT_PERSONAS = [
-    # Top Performers
-    {"name": "Maria Santos", "persona": "diligent_achiever", "email": "maria.santos@student.edu", "img": "https://i.pravatar.cc/150?img=1"},
-    {"name": "Juan Reyes", "persona": "consistent_performer", "email": "juan.reyes@student.edu", "img": "https://i.pravatar.cc/150?img=12"},
-    {"name": "Ana Cruz", "persona": "fast_learner", "email": "ana.cruz@student.edu", "img": "https://i.pravatar.cc/150?img=5"},
-    {"name": "Carlos Mendoza", "persona": "methodical_student", "email": "carlos.mendoza@student.edu", "img": "https://i.pravatar.cc/150?img=11"},
-    {"name": "Sofia Rodriguez", "persona": "high_achiever", "email": "sofia.rodriguez@student.edu", "img": "https://i.pravatar.cc/150?img=9"},
-    
-    # Mid-Level Students
-    {"name": "Miguel Torres", "persona": "improving_student", "email": "miguel.torres@student.edu", "img": "https://i.pravatar.cc/150?img=3"},
-    {"name": "Elena Ramirez", "persona": "inconsistent_performer", "email": "elena.ramirez@student.edu", "img": "https://i.pravatar.cc/150?img=10"},
-    {"name": "Diego Flores", "persona": "late_bloomer", "email": "diego.flores@student.edu", "img": "https://i.pravatar.cc/150?img=8"},
-    {"name": "Isabel Garcia", "persona": "average_student", "email": "isabel.garcia@student.edu", "img": "https://i.pravatar.cc/150?img=4"},
-    {"name": "Roberto Diaz", "persona": "slow_but_steady", "email": "roberto.diaz@student.edu", "img": "https://i.pravatar.cc/150?img=7"},
-    
-    # Struggling Students
-    {"name": "Patricia Luna", "persona": "struggling_student", "email": "patricia.luna@student.edu", "img": "https://i.pravatar.cc/150?img=2"},
-    {"name": "Fernando Castillo", "persona": "procrastinator", "email": "fernando.castillo@student.edu", "img": "https://i.pravatar.cc/150?img=6"},
-    {"name": "Carmen Morales", "persona": "overwhelmed_student", "email": "carmen.morales@student.edu", "img": "https://i.pravatar.cc/150?img=24"},
-    {"name": "Luis Alvarez", "persona": "unmotivated_student", "email": "luis.alvarez@student.edu", "img": "https://i.pravatar.cc/150?img=15"},
-    {"name": "Rosa Jimenez", "persona": "conceptual_struggler", "email": "rosa.jimenez@student.edu", "img": "https://i.pravatar.cc/150?img=20"},
-]
-
-PERSONA_BASE_SCORES = {
-    "diligent_achiever": {"default": 92, "min": 85, "max": 100},
-    "consistent_performer": {"default": 88, "min": 82, "max": 94},
-    "fast_learner": {"default": 85, "min": 75, "max": 98},
-    "methodical_student": {"default": 86, "min": 80, "max": 92},
-    "high_achiever": {"default": 95, "min": 90, "max": 100},
-    
-    "improving_student": {"default": 78, "min": 70, "max": 85},
-    "inconsistent_performer": {"default": 75, "min": 60, "max": 90},
-    "late_bloomer": {"default": 72, "min": 65, "max": 80},
-    "average_student": {"default": 75, "min": 70, "max": 80},
-    "slow_but_steady": {"default": 74, "min": 70, "max": 78},
-    
-    "struggling_student": {"default": 60, "min": 50, "max": 70},
-    "procrastinator": {"default": 55, "min": 40, "max": 75},
-    "overwhelmed_student": {"default": 58, "min": 45, "max": 65},
-    "unmotivated_student": {"default": 50, "min": 30, "max": 60},
-    "conceptual_struggler": {"default": 52, "min": 40, "max": 65},
-}
\ No newline at end of file
+# Defined once in test/personas.py; PERSONA_BASE_SCORES is per Bloom level
+# and persona_range() gives the flat default/min/max band.
+from test.personas import (
+    Persona, STUDENT_PERSONAS, BLOOM_LEVELS, BloomScores,
+    PERSONA_BASE_SCORES, ScoreRange, persona_range,
+    PERSONA_INDEX, BLOOM_INDEX, BASE_SCORES_ARR, score_of,
+)
+
+# Every seeding script writes the same roster: student N (1-based, zero
+# padded) of STUDENT_PERSONAS is "<prefix>student_NN"
+STUDENT_SUFFIXES: Final = tuple(f"{i+1:02d}" for i in range(len(STUDENT_PERSONAS)))
+STUDENT_IDS: Final = tuple(f"{TEST_PREFIX}student_{suffix}" for suffix in STUDENT_SUFFIXES)
+
+
+def subject_suffix(subject_id: str) -> str:
+    """
+    Key used in the IDs of a subject's documents (TOS, diagnostic, results),
+    e.g. "demo_subj_abnormal_psych" -> "abnormal_psych". The whole slug is
+    kept: several subjects share their last word ("psych").
+    """
+    return subject_id.removeprefix(f"{TEST_PREFIX}subj_")
+
+# Passing mark of every seeded diagnostic assessment, also used to decide
+# each seeded result's passing_status
+PASSING_SCORE: Final = 75.0
+
+# Seed for the populators' random generators; set SEED_RANDOM_SEED to get the
+# same dataset on every run (unset = fresh entropy each run)
+_random_seed = os.getenv("SEED_RANDOM_SEED")
+RANDOM_SEED: Final = int(_random_seed) if _random_seed else None
+
+# ============================================================
+# 4. CLEANUP (Collections that may hold test documents)
+# ============================================================
+CLEANUP_COLLECTIONS = (
+    "student_analytics_reports",
+    "subjects",
+    "assessments",
+    "diagnostic_assessments",
+    "diagnostic_results",
+    "recommendations",
+    "activities",
+    "study_sessions",
+    "modules",
+    "quizzes",
+    "tos",
+    "user_profiles",
+)
+
+# DESTRUCTIVE: when set, cleanup deletes EVERY document in the collections
+# above (not just TEST_PREFIX ones) with Firestore's recursive_delete.
+# Only enable this against a dev/CI Firestore project that holds test data only.
+FULL_WIPE = os.getenv("CLEANUP_FULL_WIPE", "").lower() in ("1", "true", "yes")
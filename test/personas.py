@@ -0,0 +1,99 @@
+# test/personas.py
+"""
+Canonical student personas and their per-Bloom base scores, shared by the
+seeding scripts. The flat default/min/max band is derived from the
+Bloom-level scores by persona_range().
+"""
+import functools
+from collections import namedtuple
+from dataclasses import dataclass, field
+from types import MappingProxyType
+
+import numpy as np
+
+BLOOM_LEVELS = ("remembering", "understanding", "applying", "analyzing", "evaluating", "creating")
+
+@dataclass(slots=True, frozen=True)
+class Persona:
+    name: str
+    persona: str
+    email: str
+    img: str
+    # Split from 'name' once, when the persona table is built
+    first_name: str = field(init=False)
+    last_name: str = field(init=False)
+
+    def __post_init__(self):
+        first, _, last = self.name.partition(" ")
+        object.__setattr__(self, "first_name", first)
+        object.__setattr__(self, "last_name", last or "Student")
+
+_RAW_STUDENT_PERSONAS = (
+    # Top Performers (5) - Will pass
+    {"name": "Maria Santos", "persona": "diligent_achiever", "email": "maria.santos@student.edu", "img": "https://i.pravatar.cc/150?img=1"},
+    {"name": "Juan Reyes", "persona": "consistent_performer", "email": "juan.reyes@student.edu", "img": "https://i.pravatar.cc/150?img=12"},
+    {"name": "Ana Cruz", "persona": "fast_learner", "email": "ana.cruz@student.edu", "img": "https://i.pravatar.cc/150?img=5"},
+    {"name": "Carlos Mendoza", "persona": "methodical_student", "email": "carlos.mendoza@student.edu", "img": "https://i.pravatar.cc/150?img=11"},
+    {"name": "Sofia Rodriguez", "persona": "high_achiever", "email": "sofia.rodriguez@student.edu", "img": "https://i.pravatar.cc/150?img=9"},
+    
+    # Mid-Level Students (5) - Mixed results
+    {"name": "Miguel Torres", "persona": "improving_student", "email": "miguel.torres@student.edu", "img": "https://i.pravatar.cc/150?img=3"},
+    {"name": "Elena Ramirez", "persona": "inconsistent_performer", "email": "elena.ramirez@student.edu", "img": "https://i.pravatar.cc/150?img=10"},
+    {"name": "Diego Flores", "persona": "late_bloomer", "email": "diego.flores@student.edu", "img": "https://i.pravatar.cc/150?img=8"},
+    {"name": "Isabel Garcia", "persona": "average_student", "email": "isabel.garcia@student.edu", "img": "https://i.pravatar.cc/150?img=4"},
+    {"name": "Roberto Diaz", "persona": "slow_but_steady", "email": "roberto.diaz@student.edu", "img": "https://i.pravatar.cc/150?img=7"},
+    
+    # Struggling Students (5) - At risk of failing
+    {"name": "Patricia Luna", "persona": "struggling_student", "email": "patricia.luna@student.edu", "img": "https://i.pravatar.cc/150?img=2"},
+    {"name": "Fernando Castillo", "persona": "procrastinator", "email": "fernando.castillo@student.edu", "img": "https://i.pravatar.cc/150?img=6"},
+    {"name": "Carmen Morales", "persona": "overwhelmed_student", "email": "carmen.morales@student.edu", "img": "https://i.pravatar.cc/150?img=24"},
+    {"name": "Luis Alvarez", "persona": "unmotivated_student", "email": "luis.alvarez@student.edu", "img": "https://i.pravatar.cc/150?img=15"},
+    {"name": "Rosa Jimenez", "persona": "conceptual_struggler", "email": "rosa.jimenez@student.edu", "img": "https://i.pravatar.cc/150?img=20"},
+)
+STUDENT_PERSONAS = tuple(Persona(**d) for d in _RAW_STUDENT_PERSONAS)
+
+# Base score of a persona at each Bloom level (e.g. scores.analyzing)
+BloomScores = namedtuple("BloomScores", BLOOM_LEVELS)
+
+PERSONA_BASE_SCORES = MappingProxyType({
+    # Top performers
+    "diligent_achiever": BloomScores(95, 92, 88, 85, 82, 80),
+    "consistent_performer": BloomScores(90, 88, 85, 82, 80, 78),
+    "fast_learner": BloomScores(92, 95, 90, 88, 85, 82),
+    "methodical_student": BloomScores(88, 90, 92, 90, 88, 85),
+    "high_achiever": BloomScores(98, 95, 92, 90, 88, 85),
+    
+    # Mid-level
+    "improving_student": BloomScores(75, 72, 78, 75, 72, 70),
+    "inconsistent_performer": BloomScores(85, 70, 75, 68, 72, 65),
+    "late_bloomer": BloomScores(70, 72, 75, 78, 80, 75),
+    "average_student": BloomScores(75, 75, 75, 75, 75, 75),
+    "slow_but_steady": BloomScores(78, 75, 72, 70, 68, 65),
+    
+    # Struggling
+    "struggling_student": BloomScores(65, 62, 58, 55, 52, 50),
+    "procrastinator": BloomScores(60, 58, 55, 52, 50, 48),
+    "overwhelmed_student": BloomScores(68, 65, 60, 58, 55, 52),
+    "unmotivated_student": BloomScores(62, 60, 58, 55, 52, 50),
+    "conceptual_struggler": BloomScores(75, 60, 55, 50, 48, 45),
+})
+
+# The same table packed as an (n_personas, 6) int8 matrix so score
+# generation can index (or add noise to) a whole row at once.
+PERSONA_INDEX = MappingProxyType({p: i for i, p in enumerate(PERSONA_BASE_SCORES)})
+BLOOM_INDEX = MappingProxyType({b: i for i, b in enumerate(BLOOM_LEVELS)})
+BASE_SCORES_ARR = np.array(list(PERSONA_BASE_SCORES.values()), dtype=np.int8)
+BASE_SCORES_ARR.flags.writeable = False
+
+def score_of(persona_idx: int, bloom_idx: int) -> np.int8:
+    """Base score of a persona at a Bloom level, by PERSONA_INDEX / BLOOM_INDEX."""
+    return BASE_SCORES_ARR[persona_idx, bloom_idx]
+
+# Flat score band of a persona (e.g. scores.min)
+ScoreRange = namedtuple("ScoreRange", "default min max")
+
+@functools.cache
+def persona_range(persona: str) -> ScoreRange:
+    """Projects a persona's Bloom-level scores onto a default/min/max band."""
+    scores = PERSONA_BASE_SCORES[persona]
+    return ScoreRange(default=scores.understanding, min=min(scores), max=max(scores))
@@ -1,19 +1,28 @@
 # test/populate_test_data.py
 import asyncio
-import random
+import functools
 import sys
 import math
+import os
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from collections import defaultdict
+from collections import Counter, defaultdict
+from statistics import fmean
+
+import numpy as np
 
 # --- SETUP PATHS ---
 BASE_DIR = Path(__file__).resolve().parents[1]
 sys.path.append(str(BASE_DIR))
 
 from core.firebase import db
-from services.role_service import get_role_id_by_designation
-from test.config import TEST_PREFIX, SUBJECTS_DATA, MODULES_DATA, STUDENT_PERSONAS, PERSONA_BASE_SCORES
+from test.auth_users import create_auth_users
+from test.batch_writer import BatchWriter
+from test.config import (
+    TEST_PREFIX, SUBJECTS_DATA, MODULES_BY_SUBJECT, STUDENT_PERSONAS, PERSONA_BASE_SCORES,
+    ScoreRange, persona_range, STUDENT_IDS, STUDENT_SUFFIXES, subject_suffix, RANDOM_SEED,
+    PASSING_SCORE,
+)
 
 # --- IMPORT MODELS FOR VALIDATION ---
 from database.models import (
@@ -182,37 +191,113 @@ MOCK_ASSESSMENTS_DATA = [
 # HELPER FUNCTIONS
 # ============================================================
 
-def get_iso_time(days_ago=0, minutes_ago=0):
-    t = datetime.now(timezone.utc) - timedelta(days=days_ago, minutes=minutes_ago)
+def get_iso_time(days_ago=0, minutes_ago=0, now=None):
+    t = (now or datetime.now(timezone.utc)) - timedelta(days=days_ago, minutes=minutes_ago)
     return t.isoformat()
 
-def generate_score(persona, bloom_level):
-    config = PERSONA_BASE_SCORES.get(persona, {"default": 75, "min": 60, "max": 90})
-    difficulty = 0
-    if bloom_level in ["analyzing", "evaluating", "creating"]:
-        difficulty = 5
+# Shared by every mock module / quiz (never mutated)
+MOCK_COVER_IMAGE_URL = "https://via.placeholder.com/150"
+MOCK_QUIZ_OPTIONS = ["A", "B", "C", "D"]
+
+# ID key of each subject (e.g. "psych_assessment"), used in every derived ID
+SUBJ_SUFFIXES = {subj.id: subject_suffix(subj.id) for subj in SUBJECTS_DATA}
+# The subjects' batches commit concurrently, so a shared key would let them
+# overwrite each other's TOS / modules / quizzes
+if len(set(SUBJ_SUFFIXES.values())) != len(SUBJ_SUFFIXES):
+    raise ValueError(f"Subject ID keys must be unique: {SUBJ_SUFFIXES}")
+# Each subject's diagnostic ID, written in phase 1 and referenced by every
+# student's results
+DIAG_IDS = {subj_id: f"{TEST_PREFIX}diag_{suffix}" for subj_id, suffix in SUBJ_SUFFIXES.items()}
+
+DEFAULT_SCORE_RANGE = ScoreRange(default=75, min=60, max=90)
+# The per-student documents (diagnostic results, recommendations,
+# activities, study sessions) are emitted as plain dicts from these
+# templates, matching what the models' to_dict() produces, instead of one
+# pydantic model each. SEED_VALIDATE=1 still runs every payload through
+# its model.
+VALIDATE_SEED = os.getenv("SEED_VALIDATE", "").lower() in ("1", "true", "yes")
+ACTIVITY_TEMPLATE = {"activity_type": "module_completion", "completion_rate": 1.0, "deleted": False}
+STUDY_SESSION_TEMPLATE = {"session_type": "review", "completion_status": "completed", "deleted": False}
+DIAGNOSTIC_RESULT_TEMPLATE = {"deleted": False}
+RECOMMENDATION_TEMPLATE = {
+    "recommended_topic": "Application & Analysis",
+    "recommended_modules": [],
+    "recommended_quizzes": [],
+    "bloom_focus": "analyzing",
+    "reason": "Diagnostic result indicates weakness in analysis.",
+    "confidence": 0.85,
+    "deleted": False
+}
+
+# Higher-order Bloom levels score a few points lower
+HARD_BLOOM_LEVELS = frozenset({"analyzing", "evaluating", "creating"})
+HARD_BLOOM_PENALTY = 5
+# Bloom levels summarised in each student's analytics report
+REPORT_BLOOM_LEVELS = ("remembering", "analyzing", "creating")
+REPORT_HARD_MASK = np.array([level in HARD_BLOOM_LEVELS for level in REPORT_BLOOM_LEVELS])
+
+# Shared generator for every random draw in this script
+rng = np.random.default_rng(RANDOM_SEED)
+
+def score_range(persona) -> ScoreRange:
+    return persona_range(persona) if persona in PERSONA_BASE_SCORES else DEFAULT_SCORE_RANGE
+
+def generate_score(persona, bloom_level, u=None, config=None):
+    """
+    'u' is an optional pre-drawn uniform [0, 1) sample; one is drawn if omitted.
+    'config' is the persona's score_range(), if the caller already has it.
+    """
+    config = config or score_range(persona)
+    difficulty = HARD_BLOOM_PENALTY if bloom_level in HARD_BLOOM_LEVELS else 0
     
-    score = random.uniform(config["min"], config["max"]) - difficulty
+    if u is None:
+        u = rng.random()
+    score = config.min + (config.max - config.min) * u - difficulty
     return max(0, min(100, round(score, 2)))
 
+def generate_scores(config, u, hard):
+    """
+    Vectorized generate_score: 'u' is an array of uniform [0, 1) samples and
+    'hard' a matching boolean mask (or scalar) of hard Bloom levels.
+    """
+    return np.clip(
+        np.round(config.min + (config.max - config.min) * u - HARD_BLOOM_PENALTY * hard, 2),
+        0, 100
+    )
+
 async def ensure_roles_exist():
-    """Ensures admin, faculty, and student roles exist."""
+    """Ensures admin, faculty, and student roles exist. Returns designation -> role ID."""
     print("   > Checking roles...")
     roles_data = [
         {"id": "PifcrriKAGM6YdWORP5I", "designation": "admin", "label": "Admin"},
         {"id": "vhVbVsvMKiogI6rNLS7n", "designation": "faculty_member", "label": "Faculty Member"},
         {"id": "Tzc78QtZcaVbzFtpHoOL", "designation": "student", "label": "Student"}
     ]
-    for role in roles_data:
-        doc_ref = db.collection("roles").document(role["id"])
-        if not doc_ref.get().exists:
-            doc_ref.set(role)
 
-def create_tos_model(subject_name, tos_id):
-    """Generates a TOS object using Pydantic models."""
-    
-    # Content Sections matching TOSBase structure
-    sections = [
+    def ensure_roles():
+        # One get_all round-trip for the checks and one batch for the missing roles
+        refs = [db.collection("roles").document(role["id"]) for role in roles_data]
+        existing = {snap.id for snap in db.get_all(refs) if snap.exists}
+        batch = db.batch()
+        missing = 0
+        for ref, role in zip(refs, roles_data):
+            if ref.id not in existing:
+                batch.set(ref, role)
+                missing += 1
+        if missing:
+            batch.commit()
+
+    await asyncio.to_thread(ensure_roles)
+    # The IDs are fixed, so there is no need to read the roles back by designation
+    return {role["designation"]: role["id"] for role in roles_data}
+
+# Same for every subject (the TOS model copies it on validation)
+TOS_DIFFICULTY_DISTRIBUTION = {"easy": 0.3, "moderate": 0.4, "difficult": 0.3}
+
+@functools.cache
+def tos_sections():
+    """Content Sections matching TOSBase structure (the same for every subject)."""
+    return [
         ContentSection(
             title="Fundamental Concepts",
             weight_total=0.2,
@@ -241,15 +326,17 @@ def create_tos_model(subject_name, tos_id):
             ]
         )
     ]
-    
+
+def create_tos_model(subject_name, tos_id, created_at=None):
+    """Generates a TOS object using Pydantic models."""
     return TOS(
         id=tos_id,
         subject_name=subject_name,
         pqf_level=7,
-        difficulty_distribution={"easy": 0.3, "moderate": 0.4, "difficult": 0.3},
-        content=sections,
+        difficulty_distribution=TOS_DIFFICULTY_DISTRIBUTION,
+        content=tos_sections(),
         total_items=100,
-        created_at=get_iso_time()
+        created_at=created_at or get_iso_time()
     )
 
 # ============================================================
@@ -258,87 +345,126 @@ def create_tos_model(subject_name, tos_id):
 
 async def populate_test_data():
     print("\n🚀 STARTING FULL DATASET SIMULATION...")
-    await ensure_roles_exist()
+
+    # Nothing below depends on the Auth accounts, so their import runs in the
+    # background for the whole population and is only awaited at the end
+    print(f"   > Importing {len(STUDENT_IDS)} Auth accounts...")
+    auth_import = asyncio.create_task(
+        asyncio.to_thread(create_auth_users, zip(STUDENT_IDS, STUDENT_PERSONAS))
+    )
+
+    # The role check is overlapped with opening the batched writer's client
+    # pool. Every document below goes through that one writer.
+    writer, role_ids = await asyncio.gather(
+        asyncio.to_thread(BatchWriter),
+        ensure_roles_exist()
+    )
     
-    student_role_id = await get_role_id_by_designation("student")
+    student_role_id = role_ids.get("student")
     if not student_role_id:
         print("❌ Error: 'student' role not found in DB.")
+        await asyncio.gather(asyncio.to_thread(writer.close), auth_import)
         return
 
+    # One clock reading for the whole run; per-row timestamps only need the
+    # relative offsets (days_ago), not their own datetime.now() call.
+    now = datetime.now(timezone.utc)
+    now_iso = now.isoformat()
+
+    # Offsets are whole days in a small range, so each timestamp string is
+    # formatted once and then shared by every document that uses it
+    @functools.cache
+    def iso_days_ago(days):
+        return get_iso_time(days_ago=days, now=now)
+
     # ---------------------------------------------------------
     # 1. CREATE ACADEMIC CONTENT (Subjects, TOS, Modules, Quizzes)
     # ---------------------------------------------------------
     print("\n📚 Generating Academic Content...")
     
     created_content_map = defaultdict(list) # subject_id -> list of module objects
+    # Documents written, updated once per subject / student rather than per write
+    summary = Counter()
     
     for subj_data in SUBJECTS_DATA:
-        subj_id = subj_data["id"]
+        subj_id = subj_data.id
+        subj_suffix = SUBJ_SUFFIXES[subj_id]
+        # A subject's TOS, diagnostic, modules and quizzes are committed together
+        subject_writes = []
         
         # B. Create TOS (Table of Specifications)
-        tos_id = f"{TEST_PREFIX}tos_{subj_id.split('_')[-1]}"
-        tos_model = create_tos_model(subj_data["subject_name"], tos_id)
-        db.collection("tos").document(tos_id).set(tos_model.to_dict())
+        tos_id = f"{TEST_PREFIX}tos_{subj_suffix}"
+        tos_model = create_tos_model(subj_data.subject_name, tos_id, created_at=now_iso)
+        subject_writes.append(("tos", tos_id, tos_model.to_dict()))
 
         # A. Create Subject (Linked to TOS)
         subject_model = Subject(
-            **subj_data,
+            **subj_data._asdict(),
             subject_id=subj_id,
             active_tos_id=tos_id
         )
-        db.collection("subjects").document(subj_id).set(subject_model.to_dict())
+        subject_writes.append(("subjects", subj_id, subject_model.to_dict()))
         print(f"   + Subject: {subject_model.subject_name}")
 
         # C. Create Diagnostic Assessment
-        diag_id = f"{TEST_PREFIX}diag_{subj_id.split('_')[-1]}"
+        diag_id = DIAG_IDS[subj_id]
         diag_model = DiagnosticAssessment(
             id=diag_id,
             subject_id=subj_id,
             title=f"Diagnostic: {subject_model.subject_name}",
             total_items=50,
-            passing_score=75.0,
+            passing_score=PASSING_SCORE,
             time_limit_minutes=60,
             questions=[], # Simplified for demo
-            created_at=get_iso_time()
+            created_at=now_iso
         )
-        db.collection("diagnostic_assessments").document(diag_id).set(diag_model.to_dict())
+        subject_writes.append(("diagnostic_assessments", diag_id, diag_model.to_dict()))
 
         # D. Create Modules & Quizzes
-        modules_list = MODULES_DATA.get(subj_id, [])
+        modules_list = MODULES_BY_SUBJECT.get(subj_id, ())
         for idx, mod_def in enumerate(modules_list):
-            mod_id = f"{TEST_PREFIX}mod_{subj_id.split('_')[-1]}_{idx}"
+            mod_id = f"{TEST_PREFIX}mod_{subj_suffix}_{idx}"
             
             # Create Module
             module_model = Module(
                 id=mod_id,
                 subject_id=subj_id,
-                title=mod_def["title"],
-                bloom_level=mod_def["bloom_level"],
-                material_type=mod_def["material_type"],
-                estimated_time=mod_def["estimated_time"],
-                purpose=mod_def["purpose"],
-                cover_image_url="https://via.placeholder.com/150", 
+                title=mod_def.title,
+                bloom_level=mod_def.bloom_level,
+                material_type=mod_def.material_type,
+                estimated_time=mod_def.estimated_time,
+                purpose=mod_def.purpose,
+                cover_image_url=MOCK_COVER_IMAGE_URL,
                 author="Faculty",
-                short_description=f"Learn about {mod_def['title']}",
-                created_at=get_iso_time()
+                short_description=f"Learn about {mod_def.title}",
+                created_at=now_iso
             )
-            db.collection("modules").document(mod_id).set(module_model.to_dict())
+            subject_writes.append(("modules", mod_id, module_model.to_dict()))
             created_content_map[subj_id].append(module_model)
 
-            # Create Associated Quiz
-            quiz_id = f"{TEST_PREFIX}quiz_{mod_id.split('_')[-1]}"
+            # Create Associated Quiz (scoped to the subject like its module, so
+            # the subjects' concurrent batches never rewrite the same document)
+            quiz_id = f"{TEST_PREFIX}quiz_{subj_suffix}_{idx}"
             quiz_model = Quiz(
                 id=quiz_id,
                 question_id=f"q_{quiz_id}",
                 subject_id=subj_id,
-                topic_title=mod_def["title"],
-                bloom_level=mod_def["bloom_level"],
-                question=f"Sample question for {mod_def['title']}",
-                options=["A", "B", "C", "D"],
+                topic_title=mod_def.title,
+                bloom_level=mod_def.bloom_level,
+                question=f"Sample question for {mod_def.title}",
+                options=MOCK_QUIZ_OPTIONS,
                 answer="A",
-                created_at=get_iso_time()
+                created_at=now_iso
             )
-            db.collection("quizzes").document(quiz_id).set(quiz_model.to_dict())
+            subject_writes.append(("quizzes", quiz_id, quiz_model.to_dict()))
+
+        # One batch per subject; only a subject with hundreds of modules is split
+        writer.set_chunked(subject_writes)
+        summary.update({"subjects": 1, "modules": len(modules_list)})
+
+    # Start committing this phase's last partial batch now instead of
+    # holding it until the next phase's first write
+    writer.flush()
 
     # ---------------------------------------------------------
     # 2. CREATE MOCK ASSESSMENTS (From Frontend Requirements)
@@ -363,60 +489,77 @@ async def populate_test_data():
             purpose=data["purpose"],
             questions=questions_list,
             total_items=len(questions_list),
-            created_at=get_iso_time(),
-            updated_at=get_iso_time()
+            created_at=now_iso,
+            updated_at=now_iso
         )
         
         # Save to Firestore
-        db.collection("assessments").document(assessment_id).set(assessment.to_dict())
+        writer.set("assessments", assessment_id, assessment.to_dict())
         print(f"   ✅ Created: {assessment.title} [{assessment.purpose}]")
 
+    # Start committing this phase's last partial batch now instead of
+    # holding it until the next phase's first write
+    writer.flush()
+
     # ---------------------------------------------------------
     # 3. CREATE STUDENTS & ACTIVITY HISTORY
     # ---------------------------------------------------------
     print(f"\n👥 Creating {len(STUDENT_PERSONAS)} Students & simulating history...")
 
-    for i, student_def in enumerate(STUDENT_PERSONAS):
-        student_id = f"{TEST_PREFIX}student_{i+1:02d}"
-        persona = student_def["persona"]
-        first_name = student_def["name"].split()[0]
-        last_name = student_def["name"].split()[1]
+    for student_id, student_suffix, student_def in zip(STUDENT_IDS, STUDENT_SUFFIXES, STUDENT_PERSONAS):
+        persona = student_def.persona
+        config = score_range(persona)
+        first_name, last_name = student_def.first_name, student_def.last_name
+
+        # The student's one-off random values (profile, diagnostics, report),
+        # drawn in a few vector calls instead of a random.* call each
+        progress_values = rng.uniform(0.1, 0.9, size=3).tolist()
+        ai_confidence = float(rng.uniform(0.6, 0.95))
+        taken_idx = rng.choice(len(SUBJECTS_DATA), size=2, replace=False).tolist()
+        # Diagnostics are scored at "understanding", which is not a hard level
+        diag_scores = generate_scores(config, rng.random(2), False).tolist()
+        diag_durations = rng.integers(1800, 3001, size=2).tolist()
+        diag_days_ago = rng.integers(10, 21, size=2).tolist()
+        report_scores = generate_scores(config, rng.random(len(REPORT_BLOOM_LEVELS)), REPORT_HARD_MASK).tolist()
 
         # A. Create User Profile
         # Initialize progress dictionary
         progress_dict = {
-            "Fundamental Concepts": random.uniform(0.1, 0.9),
-            "Application & Analysis": random.uniform(0.1, 0.9),
-            "Evaluation & Synthesis": random.uniform(0.1, 0.9)
+            "Fundamental Concepts": progress_values[0],
+            "Application & Analysis": progress_values[1],
+            "Evaluation & Synthesis": progress_values[2]
         }
         
         profile_model = UserProfileModel(
             id=student_id,
-            email=student_def["email"],
+            email=student_def.email,
             first_name=first_name,
             last_name=last_name,
             nickname=first_name,
             user_name=f"{first_name.lower()}_{last_name.lower()}",
             role_id=student_role_id,
-            profile_picture=student_def["img"],
-            image=student_def["img"],
-            ai_confidence=random.uniform(0.6, 0.95),
+            profile_picture=student_def.img,
+            image=student_def.img,
+            ai_confidence=ai_confidence,
             progress=StudentProgress(root=progress_dict),
-            created_at=get_iso_time(days_ago=30)
+            created_at=iso_days_ago(30)
         )
         # Note: We use .to_dict() but handle the 'status' field manually as it's not in the base model
         profile_data = profile_model.to_dict()
         profile_data["status"] = "offline" 
-        db.collection("user_profiles").document(student_id).set(profile_data)
+        writer.set("user_profiles", student_id, profile_data)
         
-        print(f"   > Processed {student_def['name']} ({persona})...")
+        print(f"   > Processed {student_def.name} ({persona})...")
 
         # B. Simulate Diagnostic Results (Take 2 random subjects)
-        taken_subjects = random.sample(SUBJECTS_DATA, 2)
-        for subj in taken_subjects:
-            diag_id = f"{TEST_PREFIX}diag_{subj['id'].split('_')[-1]}"
-            diag_score = generate_score(persona, "understanding") 
-            result_id = f"{TEST_PREFIX}res_{student_id.split('_')[-1]}_{subj['id'].split('_')[-1]}"
+        taken_subjects = [SUBJECTS_DATA[idx] for idx in taken_idx]
+        recs_written = 0
+        for taken_i, subj in enumerate(taken_subjects):
+            subj_suffix = SUBJ_SUFFIXES[subj.id]
+            diag_id = DIAG_IDS[subj.id]
+            # From a float array, so a clamped 0 / 100 is still stored as a double
+            diag_score = diag_scores[taken_i]
+            result_id = f"{TEST_PREFIX}res_{student_suffix}_{subj_suffix}"
             
             # Mock TOS Performance
             tos_perf_list = []
@@ -429,73 +572,111 @@ async def populate_test_data():
                     "bloom_breakdown": {"remembering": diag_score, "analyzing": diag_score - 5}
                 })
 
-            diagnostic_result_model = DiagnosticResult(
-                id=result_id,
-                user_id=student_id,
-                assessment_id=diag_id,
-                subject_id=subj["id"],
-                overall_score=diag_score,
-                passing_status="passed" if diag_score >= 75 else "failed",
-                time_taken_seconds=random.randint(1800, 3000),
-                tos_performance=tos_perf_list,
-                timestamp=get_iso_time(days_ago=random.randint(10, 20))
-            )
-            db.collection("diagnostic_results").document(result_id).set(diagnostic_result_model.to_dict())
+            diagnostic_result = {
+                **DIAGNOSTIC_RESULT_TEMPLATE,
+                "id": result_id,
+                "user_id": student_id,
+                "assessment_id": diag_id,
+                "subject_id": subj.id,
+                "overall_score": diag_score,
+                "passing_status": "passed" if diag_score >= PASSING_SCORE else "failed",
+                "time_taken_seconds": diag_durations[taken_i],
+                "tos_performance": tos_perf_list,
+                "timestamp": iso_days_ago(diag_days_ago[taken_i]),
+                "created_at": now_iso
+            }
+            if VALIDATE_SEED:
+                DiagnosticResult.model_validate(diagnostic_result)
+            writer.set("diagnostic_results", result_id, diagnostic_result)
 
             # Generate Recommendations based on this result (Mock)
             if diag_score < 85:
-                rec_id = f"{TEST_PREFIX}rec_{result_id.split('_')[-1]}"
-                recommendation_model = Recommendation(
-                    id=rec_id,
-                    user_id=student_id,
-                    subject_id=subj["id"],
-                    recommended_topic="Application & Analysis",
-                    recommended_modules=[], 
-                    recommended_quizzes=[],
-                    bloom_focus="analyzing",
-                    priority="high" if diag_score < 60 else "medium",
-                    reason="Diagnostic result indicates weakness in analysis.",
-                    diagnostic_result_id=result_id,
-                    confidence=0.85,
-                    timestamp=get_iso_time()
-                )
-                db.collection("recommendations").document(rec_id).set(recommendation_model.to_dict())
+                rec_id = f"{TEST_PREFIX}rec_{subj_suffix}"
+                recommendation = {
+                    **RECOMMENDATION_TEMPLATE,
+                    "id": rec_id,
+                    "user_id": student_id,
+                    "subject_id": subj.id,
+                    "priority": "high" if diag_score < 60 else "medium",
+                    "diagnostic_result_id": result_id,
+                    "timestamp": now_iso,
+                    "created_at": now_iso
+                }
+                if VALIDATE_SEED:
+                    Recommendation.model_validate(recommendation)
+                writer.set("recommendations", rec_id, recommendation)
+                recs_written += 1
 
         # C. Simulate Activities & Study Sessions
-        num_sessions = random.randint(5, 10)
+        num_sessions = int(rng.integers(5, 11))
         total_activities = 0
         total_score_accum = 0
+        sessions_written = 0
 
+        # Draw all of this student's session numbers up front (2-3 activities
+        # per session, so at most 3 * num_sessions activity slots)
+        acts_per_session = rng.integers(2, 4, size=num_sessions).tolist()
+        sess_durations = rng.integers(1200, 3601, size=num_sessions).tolist()
+        sess_days_ago = rng.integers(1, 11, size=num_sessions).tolist()
+        max_acts = 3 * num_sessions
+        act_score_u = rng.random(max_acts)
+        act_days_ago = rng.integers(1, 11, size=max_acts).tolist()
+        # Uniform [0, 1) samples scaled to an index into each session's modules
+        act_module_u = rng.random(max_acts).tolist()
+        sess_subject_idx = rng.integers(0, len(SUBJECTS_DATA), size=num_sessions).tolist()
+
+        # Plan every session first: (session index, subject, picked modules)
+        session_plan = []
+        n_picked = 0
         for sess_idx in range(num_sessions):
-            sess_id = f"{TEST_PREFIX}sess_{student_id.split('_')[-1]}_{sess_idx}"
-            sess_subject = random.choice(SUBJECTS_DATA)
-            sess_modules = created_content_map[sess_subject["id"]]
+            sess_subject = SUBJECTS_DATA[sess_subject_idx[sess_idx]]
+            sess_modules = created_content_map[sess_subject.id]
             
             if not sess_modules: continue
 
+            # Do 2-3 activities per session, modules picked from the pre-drawn samples
+            n_mods = len(sess_modules)
+            module_picks = [
+                sess_modules[int(u * n_mods)]
+                for u in act_module_u[n_picked:n_picked + acts_per_session[sess_idx]]
+            ]
+            session_plan.append((sess_idx, sess_subject, module_picks))
+            n_picked += len(module_picks)
+
+        # ...then score all picked activities in one vectorized pass
+        hard = np.fromiter(
+            (mod.bloom_level in HARD_BLOOM_LEVELS for _, _, picks in session_plan for mod in picks),
+            dtype=bool, count=n_picked
+        )
+        act_scores = generate_scores(config, act_score_u[:n_picked], hard).tolist()
+        act_i = 0
+
+        for sess_idx, sess_subject, module_picks in session_plan:
+            sess_id = f"{TEST_PREFIX}sess_{student_suffix}_{sess_idx}"
             activities_in_session = []
             session_scores = []
+            act_prefix = f"{TEST_PREFIX}act_{student_suffix}_{sess_idx}_"
             
-            # Do 2-3 activities per session
-            for act_idx in range(random.randint(2, 3)):
-                mod = random.choice(sess_modules)
-                score = generate_score(persona, mod.bloom_level)
+            for act_idx, mod in enumerate(module_picks):
+                score = act_scores[act_i]
                 
-                act_id = f"{TEST_PREFIX}act_{student_id.split('_')[-1]}_{sess_idx}_{act_idx}"
+                act_id = f"{act_prefix}{act_idx}"
                 
-                activity_model = Activity(
-                    id=act_id,
-                    user_id=student_id,
-                    subject_id=sess_subject["id"],
-                    activity_type="module_completion",
-                    activity_ref=mod.id,
-                    bloom_level=mod.bloom_level,
-                    score=score,
-                    completion_rate=1.0,
-                    duration=mod.estimated_time,
-                    created_at=get_iso_time(days_ago=random.randint(1, 10))
-                )
-                db.collection("activities").document(act_id).set(activity_model.to_dict())
+                activity = {
+                    **ACTIVITY_TEMPLATE,
+                    "id": act_id,
+                    "user_id": student_id,
+                    "subject_id": sess_subject.id,
+                    "activity_ref": mod.id,
+                    "bloom_level": mod.bloom_level,
+                    "score": score,
+                    "duration": mod.estimated_time,
+                    "created_at": iso_days_ago(act_days_ago[act_i])
+                }
+                if VALIDATE_SEED:
+                    Activity.model_validate(activity)
+                writer.set("activities", act_id, activity)
+                act_i += 1
                 
                 activities_in_session.append(act_id)
                 session_scores.append(score)
@@ -503,47 +684,62 @@ async def populate_test_data():
                 total_score_accum += score
 
             # Create Study Session Log
-            sess_avg = sum(session_scores) / len(session_scores) if session_scores else 0
+            sess_avg = fmean(session_scores) if session_scores else 0
             
-            study_session_model = StudySession(
-                id=sess_id,
-                user_id=student_id,
-                subject_id=sess_subject["id"],
-                session_type="review",
-                activity_ids=activities_in_session,
-                duration_seconds=random.randint(1200, 3600),
-                avg_score=round(sess_avg, 2),
-                completion_status="completed",
-                timestamp=get_iso_time(days_ago=random.randint(1, 10))
-            )
-            db.collection("study_sessions").document(sess_id).set(study_session_model.to_dict())
+            study_session = {
+                **STUDY_SESSION_TEMPLATE,
+                "id": sess_id,
+                "user_id": student_id,
+                "subject_id": sess_subject.id,
+                "activity_ids": activities_in_session,
+                "duration_seconds": sess_durations[sess_idx],
+                "avg_score": round(sess_avg, 2),
+                "timestamp": iso_days_ago(sess_days_ago[sess_idx]),
+                "created_at": now_iso
+            }
+            if VALIDATE_SEED:
+                StudySession.model_validate(study_session)
+            writer.set("study_sessions", sess_id, study_session)
+            sessions_written += 1
 
         # D. Generate Student Analytics Report (Snapshot)
         avg_overall = total_score_accum / total_activities if total_activities > 0 else 0
-        db.collection("student_analytics_reports").document(student_id).set({
+        writer.set("student_analytics_reports", student_id, {
             "student_id": student_id,
             "summary": {
                 "average_score": round(avg_overall, 2),
                 "total_activities": total_activities,
                 "completion_rate": 0.95, 
                 "total_sessions": num_sessions,
-                "last_active": get_iso_time()
+                "last_active": now_iso
             },
             "performance_by_bloom": {
-                "remembering": generate_score(persona, "remembering"),
-                "analyzing": generate_score(persona, "analyzing"),
-                "creating": generate_score(persona, "creating")
+                level: score
+                for level, score in zip(REPORT_BLOOM_LEVELS, report_scores)
             },
-            "last_updated": get_iso_time()
+            "last_updated": now_iso
         })
+        summary.update({
+            "students": 1,
+            "diagnostic_results": len(taken_subjects),
+            "recommendations": recs_written,
+            "study_sessions": sessions_written,
+            "activities": total_activities,
+        })
+
+    await asyncio.gather(asyncio.to_thread(writer.close), auth_import)
 
-    print(f"\n✅ DONE. Populated:")
-    print(f"   - {len(SUBJECTS_DATA)} Subjects with TOS")
-    print(f"   - {len(SUBJECTS_DATA) * 4} Modules & Quizzes")
-    print(f"   - {len(MOCK_ASSESSMENTS_DATA)} Mock Assessments (New)")
-    print(f"   - {len(STUDENT_PERSONAS)} Students with Profiles")
-    print(f"   - {len(STUDENT_PERSONAS) * 2} Diagnostic Results")
-    print(f"   - ~{len(STUDENT_PERSONAS) * 8} Study Sessions & Activities")
+    # The summary goes out as one write
+    print("\n".join((
+        "\n✅ DONE. Populated:",
+        f"   - {summary['subjects']} Subjects with TOS",
+        f"   - {summary['modules']} Modules & Quizzes",
+        f"   - {len(MOCK_ASSESSMENTS_DATA)} Mock Assessments (New)",
+        f"   - {summary['students']} Students with Profiles",
+        f"   - {summary['diagnostic_results']} Diagnostic Results",
+        f"   - {summary['recommendations']} Recommendations",
+        f"   - {summary['study_sessions']} Study Sessions & {summary['activities']} Activities",
+    )))
 
 if __name__ == "__main__":
     asyncio.run(populate_test_data())
\ No newline at end of file
@@ -10,20 +10,29 @@ This creates a complete, demo-ready dataset with:
 """
 
 import asyncio
-from datetime import datetime, timedelta, timezone
-import random
 import sys
 from pathlib import Path
 
+import numpy as np
+
 BASE_DIR = Path(__file__).resolve().parents[1]
 sys.path.append(str(BASE_DIR))
 
 from core.firebase import db
 from database.models import get_current_iso_time
 from services.role_service import get_role_id_by_designation
-from datetime import date
+from test.auth_users import create_auth_users
+from test.batch_writer import BatchWriter
+from test.config import (
+    TEST_PREFIX, SUBJ_PSYCH_ASSESSMENT, SUBJ_ABNORMAL_PSYCH,
+    STUDENT_PERSONAS, PERSONA_INDEX, BLOOM_INDEX, BLOOM_LEVELS, BASE_SCORES_ARR,
+    STUDENT_IDS, STUDENT_SUFFIXES, subject_suffix, RANDOM_SEED, PASSING_SCORE,
+)
+from typing import Final, NamedTuple
 
-TEST_PREFIX = "demo_"
+# This dataset keeps its own (longer) IDs for these two subjects
+SUBJ_DEVELOPMENTAL_PSYCH: Final = sys.intern(f"{TEST_PREFIX}subj_developmental_psych")
+SUBJ_INDUSTRIAL_ORG_PSYCH: Final = sys.intern(f"{TEST_PREFIX}subj_industrial_org_psych")
 
 # ============================================================
 # REALISTIC SUBJECT DATA (4 RPM Exam Subjects)
@@ -31,228 +40,332 @@ TEST_PREFIX = "demo_"
 
 SUBJECTS_DATA = [
     {
-        "id": f"{TEST_PREFIX}subj_psych_assessment",
+        "id": SUBJ_PSYCH_ASSESSMENT,
         "name": "Psychological Assessment",
         "pqf_level": 7,
         "description": "Methods and tools for psychological evaluation"
     },
     {
-        "id": f"{TEST_PREFIX}subj_abnormal_psych",
+        "id": SUBJ_ABNORMAL_PSYCH,
         "name": "Abnormal Psychology",
         "pqf_level": 7,
         "description": "Understanding psychological disorders and their assessment"
     },
     {
-        "id": f"{TEST_PREFIX}subj_developmental_psych",
+        "id": SUBJ_DEVELOPMENTAL_PSYCH,
         "name": "Developmental Psychology",
         "pqf_level": 7,
         "description": "Human development across the lifespan"
     },
     {
-        "id": f"{TEST_PREFIX}subj_industrial_org_psych",
+        "id": SUBJ_INDUSTRIAL_ORG_PSYCH,
         "name": "Industrial/Organizational Psychology",
         "pqf_level": 7,
         "description": "Psychology in workplace and organizational settings"
     }
 ]
 
-def get_iso_time():
-    # 1. Get the current time, making it "aware" of the UTC timezone
-    now_utc = datetime.now(timezone.utc)
-    
-    # 2. Convert it to an ISO 8601 formatted string
-    # This will look like: '2025-11-11T09:30:15.123456+00:00'
-    return now_utc.isoformat()
+# ID key of each subject (e.g. "psych_assessment"), used in derived IDs
+SUBJ_SUFFIXES = {subj["id"]: subject_suffix(subj["id"]) for subj in SUBJECTS_DATA}
+# Each subject's group is its own set_all, so a shared key would let the
+# subjects overwrite each other's TOS / diagnostic
+if len(set(SUBJ_SUFFIXES.values())) != len(SUBJ_SUFFIXES):
+    raise ValueError(f"Subject ID keys must be unique: {SUBJ_SUFFIXES}")
+# Each subject's TOS and diagnostic document IDs. Documents don't repeat
+# their own ID (or a subject its subject_id) in their fields; readers take
+# it from doc.id.
+TOS_IDS = {subj_id: f"{TEST_PREFIX}tos_{suffix}_v1" for subj_id, suffix in SUBJ_SUFFIXES.items()}
+DIAG_IDS = {subj_id: f"{TEST_PREFIX}diag_{suffix}" for subj_id, suffix in SUBJ_SUFFIXES.items()}
 
 # ============================================================
 # REALISTIC TOS DATA (Simplified versions)
 # ============================================================
 
-def create_tos_for_subject(subject_id: str, subject_name: str):
-    """Creates a realistic TOS document"""
-    return {
-        "id": f"{TEST_PREFIX}tos_{subject_id.split('_')[-1]}_v1",
-        "subject_name": subject_name,
-        "pqf_level": 7,
-        "difficulty_distribution": {"easy": 0.30, "moderate": 0.40, "difficult": 0.30},
-        "content": [
+# Identical for every subject, so they are built once and shared by all TOS
+# docs. Kept as plain dicts/lists: the Firestore encoder only accepts real
+# dicts, so read-only MappingProxyType views can't be written directly.
+TOS_DIFFICULTY_DISTRIBUTION = {"easy": 0.30, "moderate": 0.40, "difficult": 0.30}
+TOS_CONTENT = [
+    {
+        "title": "Fundamental Concepts",
+        "sub_content": [
+            {
+                "purpose": "Define key terms and concepts",
+                "blooms_taxonomy": [{"remembering": 10}]
+            },
+            {
+                "purpose": "Explain theoretical foundations",
+                "blooms_taxonomy": [{"understanding": 10}]
+            }
+        ],
+        "no_items": 20,
+        "weight_total": 0.20
+    },
+    {
+        "title": "Application and Analysis",
+        "sub_content": [
             {
-                "title": "Fundamental Concepts",
-                "sub_content": [
-                    {
-                        "purpose": "Define key terms and concepts",
-                        "blooms_taxonomy": [{"remembering": 10}]
-                    },
-                    {
-                        "purpose": "Explain theoretical foundations",
-                        "blooms_taxonomy": [{"understanding": 10}]
-                    }
-                ],
-                "no_items": 20,
-                "weight_total": 0.20
+                "purpose": "Apply concepts to case studies",
+                "blooms_taxonomy": [{"applying": 15}]
             },
             {
-                "title": "Application and Analysis",
-                "sub_content": [
-                    {
-                        "purpose": "Apply concepts to case studies",
-                        "blooms_taxonomy": [{"applying": 15}]
-                    },
-                    {
-                        "purpose": "Analyze psychological phenomena",
-                        "blooms_taxonomy": [{"analyzing": 15}]
-                    }
-                ],
-                "no_items": 30,
-                "weight_total": 0.30
+                "purpose": "Analyze psychological phenomena",
+                "blooms_taxonomy": [{"analyzing": 15}]
+            }
+        ],
+        "no_items": 30,
+        "weight_total": 0.30
+    },
+    {
+        "title": "Evaluation and Integration",
+        "sub_content": [
+            {
+                "purpose": "Evaluate methods and approaches",
+                "blooms_taxonomy": [{"evaluating": 20}]
             },
             {
-                "title": "Evaluation and Integration",
-                "sub_content": [
-                    {
-                        "purpose": "Evaluate methods and approaches",
-                        "blooms_taxonomy": [{"evaluating": 20}]
-                    },
-                    {
-                        "purpose": "Synthesize multiple perspectives",
-                        "blooms_taxonomy": [{"creating": 10}]
-                    }
-                ],
-                "no_items": 30,
-                "weight_total": 0.30
+                "purpose": "Synthesize multiple perspectives",
+                "blooms_taxonomy": [{"creating": 10}]
+            }
+        ],
+        "no_items": 30,
+        "weight_total": 0.30
+    },
+    {
+        "title": "Professional Practice",
+        "sub_content": [
+            {
+                "purpose": "Apply ethical guidelines",
+                "blooms_taxonomy": [{"applying": 10}]
             },
             {
-                "title": "Professional Practice",
-                "sub_content": [
-                    {
-                        "purpose": "Apply ethical guidelines",
-                        "blooms_taxonomy": [{"applying": 10}]
-                    },
-                    {
-                        "purpose": "Evaluate professional scenarios",
-                        "blooms_taxonomy": [{"evaluating": 10}]
-                    }
-                ],
-                "no_items": 20,
-                "weight_total": 0.20
+                "purpose": "Evaluate professional scenarios",
+                "blooms_taxonomy": [{"evaluating": 10}]
             }
         ],
+        "no_items": 20,
+        "weight_total": 0.20
+    }
+]
+
+def create_tos_for_subject(subject_id: str, subject_name: str):
+    """Creates a realistic TOS document (stored under TOS_IDS[subject_id])"""
+    return {
+        "subject_name": subject_name,
+        "pqf_level": 7,
+        "difficulty_distribution": TOS_DIFFICULTY_DISTRIBUTION,
+        "content": TOS_CONTENT,
         "total_items": 100,
         "is_active": True
     }
 
 # ============================================================
-# REALISTIC STUDENT PERSONAS (15 Students)
+# DIAGNOSTIC ASSESSMENT GENERATOR
 # ============================================================
 
-STUDENT_PERSONAS = [
-    # Top Performers (5) - Will pass
-    {"name": "Maria Santos", "persona": "diligent_achiever", "email": "maria.santos@student.edu"},
-    {"name": "Juan Reyes", "persona": "consistent_performer", "email": "juan.reyes@student.edu"},
-    {"name": "Ana Cruz", "persona": "fast_learner", "email": "ana.cruz@student.edu"},
-    {"name": "Carlos Mendoza", "persona": "methodical_student", "email": "carlos.mendoza@student.edu"},
-    {"name": "Sofia Rodriguez", "persona": "high_achiever", "email": "sofia.rodriguez@student.edu"},
-    
-    # Mid-Level Students (5) - Mixed results
-    {"name": "Miguel Torres", "persona": "improving_student", "email": "miguel.torres@student.edu"},
-    {"name": "Elena Ramirez", "persona": "inconsistent_performer", "email": "elena.ramirez@student.edu"},
-    {"name": "Diego Flores", "persona": "late_bloomer", "email": "diego.flores@student.edu"},
-    {"name": "Isabel Garcia", "persona": "average_student", "email": "isabel.garcia@student.edu"},
-    {"name": "Roberto Diaz", "persona": "slow_but_steady", "email": "roberto.diaz@student.edu"},
-    
-    # Struggling Students (5) - At risk of failing
-    {"name": "Patricia Luna", "persona": "struggling_student", "email": "patricia.luna@student.edu"},
-    {"name": "Fernando Castillo", "persona": "procrastinator", "email": "fernando.castillo@student.edu"},
-    {"name": "Carmen Morales", "persona": "overwhelmed_student", "email": "carmen.morales@student.edu"},
-    {"name": "Luis Alvarez", "persona": "unmotivated_student", "email": "luis.alvarez@student.edu"},
-    {"name": "Rosa Jimenez", "persona": "conceptual_struggler", "email": "rosa.jimenez@student.edu"},
-]
+# Shared by every generated question (never mutated)
+SAMPLE_OPTIONS = ["Option A", "Option B", "Option C", "Option D"]
+SAMPLE_ANSWER = SAMPLE_OPTIONS[0]
+# Sample questions generated per TOS bloom entry
+QUESTIONS_PER_BLOOM = 2
+DIAGNOSTIC_INSTRUCTIONS = (
+    "This diagnostic test will help identify your strengths and areas for improvement. "
+    "Answer all questions to the best of your ability."
+)
 
-# ============================================================
-# DIAGNOSTIC ASSESSMENT GENERATOR
-# ============================================================
+class QuestionSpec(NamedTuple):
+    """One TOS bloom entry: 'count' sample questions share its topic, level and text."""
+    topic_title: str
+    bloom_level: str
+    question: str
+    count: int
 
-def generate_diagnostic_assessment(subject_id: str, subject_name: str, tos_data: dict):
-    """Creates a realistic diagnostic assessment"""
-    questions = []
-    q_num = 1
-    
-    # Generate questions for each TOS topic
+def generate_diagnostic_assessment(subject_id: str, subject_name: str, tos_data: dict, created_at: str | None = None):
+    """Creates a realistic diagnostic assessment (stored under DIAG_IDS[subject_id])"""
+    # One spec per TOS bloom entry
+    specs = []
     for section in tos_data["content"]:
         topic_title = section["title"]
-        
         for sub in section.get("sub_content", []):
             for bloom_entry in sub.get("blooms_taxonomy", []):
-                bloom_level = list(bloom_entry.keys())[0]
-                count = bloom_entry[bloom_level]
-                
-                # Generate 2 sample questions per bloom level
-                for i in range(min(2, count)):
-                    questions.append({
-                        "question_id": f"q{q_num}",
-                        "tos_topic_title": topic_title,
-                        "bloom_level": bloom_level,
-                        "question": f"Sample {bloom_level} question for {topic_title}",
-                        "options": ["Option A", "Option B", "Option C", "Option D"],
-                        "answer": "Option A",
-                        "cognitive_weight": 1.0
-                    })
-                    q_num += 1
+                bloom_level, count = next(iter(bloom_entry.items()))
+                specs.append(QuestionSpec(
+                    topic_title, bloom_level,
+                    f"Sample {bloom_level} question for {topic_title}",
+                    min(QUESTIONS_PER_BLOOM, count)
+                ))
+    
+    # Expand the specs into question dicts (the Firestore payload) in a single flat pass
+    questions = [
+        {
+            "question_id": f"q{q_num}",
+            "tos_topic_title": spec.topic_title,
+            "bloom_level": spec.bloom_level,
+            "question": spec.question,
+            "options": SAMPLE_OPTIONS,
+            "answer": SAMPLE_ANSWER,
+            "cognitive_weight": 1.0
+        }
+        for q_num, spec in enumerate(
+            (spec for spec in specs for _ in range(spec.count)),
+            start=1
+        )
+    ]
     
     return {
-        "id": f"{TEST_PREFIX}diag_{subject_id.split('_')[-1]}",
         "subject_id": subject_id,
         "title": f"Diagnostic Assessment: {subject_name}",
-        "instructions": (
-            "This diagnostic test will help identify your strengths and areas for improvement. "
-            "Answer all questions to the best of your ability."
-        ),
+        "instructions": DIAGNOSTIC_INSTRUCTIONS,
         "total_items": len(questions),
         "questions": questions,
-        "passing_score": 75.0,
+        "passing_score": PASSING_SCORE,
         "time_limit_minutes": 60,
-        "created_at": get_iso_time(),
+        "created_at": created_at or get_current_iso_time(),
         "deleted": False
     }
 
 # ============================================================
-# REALISTIC SCORE GENERATOR
+# DIAGNOSTIC RESULT SIMULATION
 # ============================================================
 
-def generate_realistic_diagnostic_score(persona: str, bloom_level: str, topic: str) -> float:
+rng = np.random.default_rng(RANDOM_SEED)
+N_BLOOMS = len(BLOOM_LEVELS)
+
+class QuestionIndex(NamedTuple):
+    """
+    A diagnostic's question layout, shared by every student taking it. The
+    counts only depend on the layout, so they are computed here once rather
+    than per student.
+    """
+    topics: list             # topic titles, first-seen order
+    topic_ids: np.ndarray    # per-question topic index
+    bloom_ids: np.ndarray    # per-question Bloom index
+    topic_blooms: list       # Bloom indexes seen in each topic, first-seen order
+    cells: np.ndarray        # per-question flat (topic, bloom) cell index
+    topic_total: np.ndarray  # questions per topic
+    cell_counts: np.ndarray  # questions per (topic, bloom) cell, flat
+
+def index_diagnostic_questions(diag: dict) -> QuestionIndex:
+    """Builds the QuestionIndex of a diagnostic assessment's questions."""
+    questions = diag["questions"]
+    topics = list(dict.fromkeys(q["tos_topic_title"] for q in questions))
+    topic_pos = {title: t for t, title in enumerate(topics)}
+    topic_ids = np.array([topic_pos[q["tos_topic_title"]] for q in questions], dtype=np.intp)
+    bloom_ids = np.array([BLOOM_INDEX[q["bloom_level"]] for q in questions], dtype=np.intp)
+    topic_blooms = [[] for _ in topics]
+    for t, b in dict.fromkeys(zip(topic_ids.tolist(), bloom_ids.tolist())):
+        topic_blooms[t].append(b)
+    n_topics = len(topics)
+    cells = topic_ids * N_BLOOMS + bloom_ids
+    return QuestionIndex(
+        topics, topic_ids, bloom_ids, topic_blooms, cells,
+        topic_total=np.bincount(topic_ids, minlength=n_topics),
+        cell_counts=np.bincount(cells, minlength=n_topics * N_BLOOMS),
+    )
+
+# Diagnostics every student takes (to simulate realistic progress)
+TAKEN_SUBJECTS = SUBJECTS_DATA[:2]
+
+def simulate_diagnostics(writer: BatchWriter, now_iso: str, diagnostics: dict, log: list):
     """
-    Generates realistic scores based on student persona, cognitive level, and topic.
+    Scores every (student, taken subject) pair and queues the results on
+    'writer'. 'diagnostics' maps subject ID -> the QuestionIndex of the
+    diagnostic assessment written for it. Progress lines are appended to 'log'.
     """
-    base_scores = {
-        # Top performers
-        "diligent_achiever": {"remembering": 95, "understanding": 92, "applying": 88, "analyzing": 85, "evaluating": 82, "creating": 80},
-        "consistent_performer": {"remembering": 90, "understanding": 88, "applying": 85, "analyzing": 82, "evaluating": 80, "creating": 78},
-        "fast_learner": {"remembering": 92, "understanding": 95, "applying": 90, "analyzing": 88, "evaluating": 85, "creating": 82},
-        "methodical_student": {"remembering": 88, "understanding": 90, "applying": 92, "analyzing": 90, "evaluating": 88, "creating": 85},
-        "high_achiever": {"remembering": 98, "understanding": 95, "applying": 92, "analyzing": 90, "evaluating": 88, "creating": 85},
+    n_students = len(STUDENT_PERSONAS)
+    students = np.arange(n_students)[:, None]
+    # Base-score row of each student's persona; unknown personas score 70
+    persona_rows = [PERSONA_INDEX.get(s.persona) for s in STUDENT_PERSONAS]
+    known = np.array([row is not None for row in persona_rows])[:, None]
+    student_scores = BASE_SCORES_ARR[[row or 0 for row in persona_rows]]
+    # Time taken for every result in one draw
+    durations = rng.integers(2400, 3601, size=(n_students, len(TAKEN_SUBJECTS))).tolist()
+    
+    # (student, taken subject index) -> result, filled subject by subject
+    results = [[None] * len(TAKEN_SUBJECTS) for _ in range(n_students)]
+    for j, subj_data in enumerate(TAKEN_SUBJECTS):
+        subj_id = subj_data["id"]
+        # Reuse the question index built in phase 1 instead of reading the
+        # assessment back; every subject gets one, so there is no missing case
+        index = diagnostics[subj_id]
+        topics, topic_blooms = index.topics, index.topic_blooms
+        n_questions, n_topics = len(index.bloom_ids), len(topics)
+        n_cells = n_topics * N_BLOOMS
         
-        # Mid-level
-        "improving_student": {"remembering": 75, "understanding": 72, "applying": 78, "analyzing": 75, "evaluating": 72, "creating": 70},
-        "inconsistent_performer": {"remembering": 85, "understanding": 70, "applying": 75, "analyzing": 68, "evaluating": 72, "creating": 65},
-        "late_bloomer": {"remembering": 70, "understanding": 72, "applying": 75, "analyzing": 78, "evaluating": 80, "creating": 75},
-        "average_student": {"remembering": 75, "understanding": 75, "applying": 75, "analyzing": 75, "evaluating": 75, "creating": 75},
-        "slow_but_steady": {"remembering": 78, "understanding": 75, "applying": 72, "analyzing": 70, "evaluating": 68, "creating": 65},
+        # Score every student's every question in one (student, question) draw,
+        # with realistic variation (+/- 5%)
+        base = np.where(known, student_scores[:, index.bloom_ids], 70)
+        scores = np.clip(base + rng.uniform(-5, 5, size=(n_students, n_questions)), 0, 100).round(1)
         
-        # Struggling
-        "struggling_student": {"remembering": 65, "understanding": 62, "applying": 58, "analyzing": 55, "evaluating": 52, "creating": 50},
-        "procrastinator": {"remembering": 60, "understanding": 58, "applying": 55, "analyzing": 52, "evaluating": 50, "creating": 48},
-        "overwhelmed_student": {"remembering": 68, "understanding": 65, "applying": 60, "analyzing": 58, "evaluating": 55, "creating": 52},
-        "unmotivated_student": {"remembering": 62, "understanding": 60, "applying": 58, "analyzing": 55, "evaluating": 52, "creating": 50},
-        "conceptual_struggler": {"remembering": 75, "understanding": 60, "applying": 55, "analyzing": 50, "evaluating": 48, "creating": 45},
-    }
-    
-    base_score = base_scores.get(persona, {}).get(bloom_level, 70)
-    
-    # Add realistic variation (+/- 5%)
-    variation = random.uniform(-5, 5)
-    final_score = max(0, min(100, base_score + variation))
+        # Per-student totals in single bincounts: each student's keys are
+        # offset into their own range. Correct = score > 60, per topic...
+        topic_correct = np.bincount(
+            (students * n_topics + index.topic_ids).ravel(),
+            weights=(scores > 60).ravel(), minlength=n_students * n_topics
+        ).reshape(n_students, n_topics)
+        topic_scores = topic_correct / index.topic_total * 100
+        
+        # ...and the mean score per (topic, bloom) cell for the bloom
+        # breakdown; cells without questions are never read
+        cell_sums = np.bincount(
+            (students * n_cells + index.cells).ravel(),
+            weights=scores.ravel(), minlength=n_students * n_cells
+        ).reshape(n_students, n_cells)
+        cell_means = np.divide(
+            cell_sums, index.cell_counts, out=np.zeros_like(cell_sums), where=index.cell_counts > 0
+        ).reshape(n_students, n_topics, N_BLOOMS).round(1)
+        
+        # Round and convert every figure in whole-array calls, so the loops
+        # below only read plain Python numbers
+        cell_means_rows = cell_means.tolist()
+        topic_total_list = index.topic_total.tolist()
+        topic_correct_rows = topic_correct.astype(int).tolist()
+        topic_scores_rows = topic_scores.round(1).tolist()
+        overall = topic_scores.mean(axis=1).round(1)
+        overall_scores = overall.tolist()
+        passed_flags = (overall >= PASSING_SCORE).tolist()
+        
+        for i in range(n_students):
+            means, correct, pct = cell_means_rows[i], topic_correct_rows[i], topic_scores_rows[i]
+            tos_performance = [
+                {
+                    "topic_title": topic_title,
+                    "total_questions": topic_total_list[t],
+                    "correct_answers": correct[t],
+                    "score_percentage": pct[t],
+                    "bloom_breakdown": {BLOOM_LEVELS[b]: means[t][b] for b in topic_blooms[t]}
+                }
+                for t, topic_title in enumerate(topics)
+            ]
+            results[i][j] = (overall_scores[i], passed_flags[i], tos_performance)
     
-    return round(final_score, 1)
+    # Queue the results student by student, the order the log reads in
+    for i, student in enumerate(STUDENT_PERSONAS):
+        student_writes = []
+        for j, subj_data in enumerate(TAKEN_SUBJECTS):
+            overall_score, passed, tos_performance = results[i][j]
+            passing_status = "passed" if passed else "failed"
+            
+            # Save diagnostic result
+            result_id = f"{TEST_PREFIX}result_{STUDENT_SUFFIXES[i]}_{SUBJ_SUFFIXES[subj_data['id']]}"
+            student_writes.append(("diagnostic_results", result_id, {
+                "user_id": STUDENT_IDS[i],
+                "assessment_id": DIAG_IDS[subj_data["id"]],
+                "subject_id": subj_data["id"],
+                "overall_score": overall_score,
+                "passing_status": passing_status,
+                "time_taken_seconds": durations[i][j],
+                "tos_performance": tos_performance,
+                "timestamp": now_iso,
+                "created_at": now_iso,
+                "deleted": False
+            }))
+            
+            log.append(f"  ✅ {student.name}: {subj_data['name']} - {overall_score}% ({passing_status})")
+        
+        # A student's results are committed together (one batch, in every
+        # write mode), so a student never has only some of them
+        writer.set_all(student_writes)
 
 # ============================================================
 # MAIN POPULATION FUNCTION
@@ -264,153 +377,115 @@ async def populate_realistic_data():
     print("🚀 Starting REALISTIC test data population...")
     print("=" * 60)
     
-    # Get student role
-    student_role_id = await get_role_id_by_designation("student")
+    # Get student role while the batched writer opens its client pool (off
+    # the event loop); every document below goes through that one writer
+    student_role_id, writer = await asyncio.gather(
+        get_role_id_by_designation("student"),
+        asyncio.to_thread(BatchWriter)
+    )
     if not student_role_id:
         print("❌ CRITICAL: 'student' role not found!")
+        await asyncio.to_thread(writer.close)
         return
     
+    # Nothing below depends on the Auth accounts, so their import runs in the
+    # background for the whole population and is only awaited at the end.
+    # It starts only once the role is known, so a failed run leaves no Auth
+    # accounts without profiles.
+    print(f"   > Importing {len(STUDENT_IDS)} Auth accounts...")
+    auth_import = asyncio.create_task(
+        asyncio.to_thread(create_auth_users, zip(STUDENT_IDS, STUDENT_PERSONAS))
+    )
+    
+    # One timestamp for every document written by this run
+    now_iso = get_current_iso_time()
+    
+    # subject ID -> its diagnostic's question index, built once here and
+    # reused when scoring every student
+    diagnostics = {}
+    
     # 1. CREATE SUBJECTS AND TOS
     print("\n📚 Creating 4 Psychology subjects with TOS...")
+    # Progress lines are collected per phase and printed in one write
+    log = []
     for subj_data in SUBJECTS_DATA:
+        subj_id = subj_data["id"]
+        tos_id, diag_id = TOS_IDS[subj_id], DIAG_IDS[subj_id]
+        
         # Create subject
-        subj_ref = db.collection("subjects").document(subj_data["id"])
-        tos_data = create_tos_for_subject(subj_data["id"], subj_data["name"])
+        tos_data = create_tos_for_subject(subj_id, subj_data["name"])
         
-        subj_ref.set({
-            "id": subj_data["id"],
-            "subject_id": subj_data["id"],
+        subject_doc = {
             "subject_name": subj_data["name"],
             "pqf_level": subj_data["pqf_level"],
-            "active_tos_id": tos_data["id"],
+            "active_tos_id": tos_id,
             "deleted": False
-        })
-        
-        # Create TOS
-        tos_ref = db.collection("tos").document(tos_data["id"])
-        tos_ref.set(tos_data)
+        }
         
         # Create Diagnostic Assessment
-        diag_data = generate_diagnostic_assessment(subj_data["id"], subj_data["name"], tos_data)
-        diag_ref = db.collection("diagnostic_assessments").document(diag_data["id"])
-        diag_ref.set(diag_data)
+        diag_data = generate_diagnostic_assessment(subj_id, subj_data["name"], tos_data, created_at=now_iso)
+        diagnostics[subj_id] = index_diagnostic_questions(diag_data)
+        
+        # The subject, its TOS and its diagnostic land in the same batch, so a
+        # subject is never left pointing at a missing TOS
+        writer.set_all((
+            ("subjects", subj_id, subject_doc),
+            ("tos", tos_id, tos_data),
+            ("diagnostic_assessments", diag_id, diag_data),
+        ))
         
-        print(f"  ✅ {subj_data['name']}")
-        print(f"     - TOS: {tos_data['id']}")
-        print(f"     - Diagnostic: {diag_data['id']} ({diag_data['total_items']} questions)")
+        log.append(f"  ✅ {subj_data['name']}")
+        log.append(f"     - TOS: {tos_id}")
+        log.append(f"     - Diagnostic: {diag_id} ({diag_data['total_items']} questions)")
+    
+    # Start committing this phase's last partial batch now
+    writer.flush()
+    print("\n".join(log))
+    log.clear()
     
     # 2. CREATE STUDENTS
     print(f"\n👥 Creating {len(STUDENT_PERSONAS)} realistic students...")
-    for i, student in enumerate(STUDENT_PERSONAS):
-        student_id = f"{TEST_PREFIX}student_{i+1:02d}"
+    for student_id, student in zip(STUDENT_IDS, STUDENT_PERSONAS):
+        first_name, last_name = student.first_name, student.last_name
         
-        db.collection("user_profiles").document(student_id).set({
-            "id": student_id,
-            "email": student["email"],
-            "first_name": student["name"].split()[0],
-            "last_name": student["name"].split()[1],
+        writer.set("user_profiles", student_id, {
+            "email": student.email,
+            "first_name": first_name,
+            "last_name": last_name,
             "role_id": student_role_id,
             "pre_assessment_score": None,  # Will be set after diagnostic
             "progress": {},
-            "created_at": get_iso_time(),
+            "created_at": now_iso,
             "deleted": False
         })
         
-        print(f"  ✅ {student['name']} ({student['persona']})")
+        log.append(f"  ✅ {student.name} ({student.persona})")
+    
+    # Start committing this phase's last partial batch now
+    writer.flush()
+    print("\n".join(log))
+    log.clear()
     
     # 3. GENERATE DIAGNOSTIC RESULTS FOR ALL STUDENTS
     print("\n🧪 Generating diagnostic test results...")
-    for i, student in enumerate(STUDENT_PERSONAS):
-        student_id = f"{TEST_PREFIX}student_{i+1:02d}"
-        persona = student["persona"]
-        
-        # Take diagnostic for first 2 subjects (to simulate realistic progress)
-        for subj_data in SUBJECTS_DATA[:2]:
-            diag_id = f"{TEST_PREFIX}diag_{subj_data['id'].split('_')[-1]}"
-            
-            # Fetch the diagnostic assessment
-            diag_doc = db.collection("diagnostic_assessments").document(diag_id).get()
-            if not diag_doc.exists:
-                continue
-            
-            diag = diag_doc.to_dict()
-            
-            # Calculate TOS performance
-            tos_performance = []
-            all_scores = []
-            
-            # Group questions by TOS topic
-            from collections import defaultdict
-            topic_questions = defaultdict(lambda: {"questions": [], "bloom_breakdown": defaultdict(list)})
-            
-            for q in diag["questions"]:
-                topic_questions[q["tos_topic_title"]]["questions"].append(q)
-                
-            # Calculate performance for each topic
-            for topic_title, data in topic_questions.items():
-                topic_correct = 0
-                topic_total = len(data["questions"])
-                
-                bloom_scores = defaultdict(lambda: {"correct": 0, "total": 0})
-                
-                for q in data["questions"]:
-                    bloom = q["bloom_level"]
-                    score = generate_realistic_diagnostic_score(persona, bloom, topic_title)
-                    
-                    # Simulate correct/incorrect (score > 60 = correct)
-                    if score > 60:
-                        topic_correct += 1
-                        bloom_scores[bloom]["correct"] += 1
-                    
-                    bloom_scores[bloom]["total"] += 1
-                    data["bloom_breakdown"][bloom].append(score)
-                
-                topic_score = (topic_correct / topic_total) * 100
-                all_scores.append(topic_score)
-                
-                # Calculate bloom breakdown
-                bloom_breakdown = {}
-                for bloom, scores in data["bloom_breakdown"].items():
-                    bloom_breakdown[bloom] = round(sum(scores) / len(scores), 1)
-                
-                tos_performance.append({
-                    "topic_title": topic_title,
-                    "total_questions": topic_total,
-                    "correct_answers": topic_correct,
-                    "score_percentage": round(topic_score, 1),
-                    "bloom_breakdown": bloom_breakdown
-                })
-            
-            overall_score = round(sum(all_scores) / len(all_scores), 1)
-            passing_status = "passed" if overall_score >= 75.0 else "failed"
-            
-            # Save diagnostic result
-            result_id = f"{TEST_PREFIX}result_{student_id.split('_')[-1]}_{subj_data['id'].split('_')[-1]}"
-            db.collection("diagnostic_results").document(result_id).set({
-                "id": result_id,
-                "user_id": student_id,
-                "assessment_id": diag_id,
-                "subject_id": subj_data["id"],
-                "overall_score": overall_score,
-                "passing_status": passing_status,
-                "time_taken_seconds": random.randint(2400, 3600),
-                "tos_performance": tos_performance,
-                "timestamp": get_iso_time(),
-                "created_at": get_iso_time(),
-                "deleted": False
-            })
-            
-            print(f"  ✅ {student['name']}: {subj_data['name']} - {overall_score}% ({passing_status})")
+    # Scoring is pure CPU work now that nothing is read back from Firestore
+    simulate_diagnostics(writer, now_iso, diagnostics, log)
+    print("\n".join(log))
+    
+    await asyncio.gather(asyncio.to_thread(writer.close), auth_import)
     
-    print("\n" + "=" * 60)
-    print("🎉 REALISTIC DATA POPULATION COMPLETE!")
-    print("\n📊 Summary:")
-    print(f"  - {len(SUBJECTS_DATA)} Subjects")
-    print(f"  - {len(SUBJECTS_DATA)} TOS Documents")
-    print(f"  - {len(SUBJECTS_DATA)} Diagnostic Assessments")
-    print(f"  - {len(STUDENT_PERSONAS)} Students")
-    print(f"  - {len(STUDENT_PERSONAS) * 2} Diagnostic Results")
-    print("\n✨ Ready for demo!")
+    # The summary goes out as one write
+    print("\n".join((
+        "\n" + "=" * 60,
+        "🎉 REALISTIC DATA POPULATION COMPLETE!",
+        "\n📊 Summary:",
+        f"  - {len(SUBJECTS_DATA)} Subjects",
+        f"  - {len(SUBJECTS_DATA)} TOS Documents",
+        f"  - {len(SUBJECTS_DATA)} Diagnostic Assessments",
+        f"  - {len(STUDENT_PERSONAS)} Students",
+        f"  - {len(STUDENT_PERSONAS) * len(TAKEN_SUBJECTS)} Diagnostic Results",
+        "\n✨ Ready for demo!",
+    )))
 
 if __name__ == "__main__":
     asyncio.run(populate_realistic_data())
\ No newline at end of file
@@ -1,15 +1,37 @@
-import requests
+import httpx
 from fastapi import HTTPException
 from core.config import settings
 from core.firebase import db
 from database.models import UserProfileModel
 
-def firebase_login_with_email(email: str, password: str):
+# One pooled (keep-alive, HTTP/2) client for the Firebase Auth REST calls, so
+# logins and token refreshes reuse connections instead of a TLS handshake each
+_http_client: httpx.AsyncClient | None = None
+
+def get_http_client() -> httpx.AsyncClient:
+    """Returns the pooled client, (re)creating it if it was never opened or has been closed."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            http2=True,
+            timeout=10,
+            limits=httpx.Limits(max_keepalive_connections=20)
+        )
+    return _http_client
+
+async def close_http_client():
+    """Closes the pooled client (on app shutdown); the next get_http_client() opens a new one."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+async def firebase_login_with_email(email: str, password: str):
     if not settings.FIREBASE_API_KEY:
         raise RuntimeError("FIREBASE_API_KEY not set")
     url = f"https://identitytoolkit.googleapis.com/v1/accounts:signInWithPassword?key={settings.FIREBASE_API_KEY}"
     payload = {"email": email, "password": password, "returnSecureToken": True}
-    resp = requests.post(url, json=payload, timeout=10)
+    resp = await get_http_client().post(url, json=payload)
     data = resp.json()
     if resp.status_code != 200:
         msg = data.get("error", {}).get("message", "Login failed")
@@ -1,6 +1,6 @@
 # utils/status_utils.py
 import asyncio
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from core.firebase import db
 from google.cloud.firestore_v1.base_query import FieldFilter
 
@@ -11,7 +11,7 @@ async def update_user_status(uid: str, status: str):
             user_ref = db.collection("user_profiles").document(uid)
             update_data = {
                 "status": status,
-                "last_seen": datetime.utcnow()
+                "last_seen": datetime.now(timezone.utc)
             }
             # Use set with merge=True to create/update the fields
             user_ref.set(update_data, merge=True) 
@@ -25,31 +25,41 @@ async def check_offline_users():
     """
     (Scheduled Task) Mark users as offline if they haven't been seen.
     NOTE: This should be run by a scheduler, not by user APIs.
+    The query needs a composite index on user_profiles (status, last_seen).
     """
     def _check_db():
         try:
-            users = db.collection("user_profiles").where(
+            # Set cutoff to 5 minutes for a scheduled task. One clock reading
+            # serves the cutoff and every user marked offline in this pass.
+            now = datetime.now(timezone.utc)
+            cutoff = now - timedelta(minutes=5) 
+            
+            # --- FIX: let Firestore return only the stale users instead of
+            # every online/busy user filtered here ---
+            stale_users = db.collection("user_profiles").where(
                 filter=FieldFilter("status", "in", ["online", "busy"])
+            ).where(
+                filter=FieldFilter("last_seen", "<", cutoff)
             ).stream()
             
-            # Set cutoff to 5 minutes for a scheduled task
-            cutoff = datetime.utcnow() - timedelta(minutes=5) 
-            
-            for user in users:
-                data = user.to_dict()
-                last_seen = data.get("last_seen")
-                
-                if hasattr(last_seen, "timestamp"):
-                    last_seen = datetime.fromtimestamp(last_seen.timestamp())
-                
-                if last_seen and last_seen < cutoff:
-                    user.reference.update({
-                        "status": "offline",
-                        "last_seen": datetime.utcnow()
-                    })
-                    print(f"Marked {user.id} as offline (no recent activity)")
+            # Firestore batches have a 500 operation limit
+            batch = db.batch()
+            pending = 0
+            for user in stale_users:
+                batch.update(user.reference, {
+                    "status": "offline",
+                    "last_seen": now
+                })
+                pending += 1
+                print(f"Marked {user.id} as offline (no recent activity)")
+                if pending == 500:
+                    batch.commit()
+                    batch = db.batch()
+                    pending = 0
+            if pending:
+                batch.commit()
                     
         except Exception as e:
             print(f"Error checking offline status: {e}")
     
-    await asyncio.to_thread(_check_db)
\ No newline at end of file
+    await asyncio.to_thread(_check_db)